@@ -8,11 +8,18 @@ Request Flow:
     4. Calls modules/[module]/controller (request handling)
     5. Calls modules/[module]/service (business logic)
 """
+import os
+
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.config import Config
+from app.utils.response_utils import ORJSONResponse
 from app.routes.index import main_router
+from app.core.log_queue import start_log_queue, stop_log_queue
+from app.services.ai.openai_service import close_http_client
+from app.modules.universal.universal_extractor import close_text_process_pool
 
 # Initialize configuration
 Config.init_app()
@@ -22,6 +29,7 @@ app = FastAPI(
     title="DCN Ai",
     version=Config.VERSION,
     description="DCN Ai",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -29,18 +37,44 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=Config.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
 # Include all routes from index
 app.include_router(main_router)
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Size the thread pool, start queued logging and the Render keep-alive pinger"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = Config.THREAD_POOL_SIZE
+    start_log_queue()
+    
+    # Imported lazily so local/Vercel cold starts don't load the pinger
+    if os.environ.get('RENDER'):
+        from app.core.keep_alive import start_keep_alive
+        start_keep_alive()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled HTTP connections and workers, and flush queued logs"""
+    close_http_client()
+    close_text_process_pool()
+    stop_log_queue()
+
+
+# Edge/browser caching for the static GET endpoints
+ROOT_CACHE_CONTROL = "public, max-age=30, s-maxage=60, stale-while-revalidate=120"
+HEALTH_CACHE_CONTROL = "public, max-age=5, s-maxage=10"
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
-    return {
+    content = {
         "name": Config.APP_NAME,
         "version": Config.VERSION,
         "status": "running",
@@ -48,22 +82,39 @@ async def root():
         "endpoints": {
             "extract": "POST /api/extract-data",
             "detect": "POST /api/detect-acord",
+            "detect_bulk": "POST /api/detect-acord/bulk",
             "vectorize": "POST /api/vectorize",
             "vectorize_query": "POST /api/vectorize-query",
             "health": "GET /health"
         }
     }
+    return ORJSONResponse(content=content, headers={"Cache-Control": ROOT_CACHE_CONTROL})
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "version": Config.VERSION
-    }
+    # Keep max-age short so health monitors still see outages promptly
+    return ORJSONResponse(
+        content={
+            "status": "healthy",
+            "version": Config.VERSION
+        },
+        headers={"Cache-Control": HEALTH_CACHE_CONTROL}
+    )
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # Multiple workers require an import string rather than the app object
+    uvicorn.run(
+        "app.app:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", 2)),
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        log_level="warning",
+    )
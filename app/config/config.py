@@ -5,49 +5,134 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+_ENV = os.environ
+_RESOLVED = str(Path(__file__).resolve())
+
+# Vercel uses /tmp for writable storage (serverless environment)
+# Check if running on Vercel - check multiple environment variables
+IS_VERCEL = bool(
+    _ENV.get('VERCEL') or
+    _ENV.get('VERCEL_ENV') or
+    _ENV.get('VERCEL_URL') or
+    '/var/task' in _RESOLVED  # Vercel's serverless path
+)
+
 # Load environment variables from .env file
-load_dotenv()
+# (Vercel injects env vars directly, so skip the file read there)
+if not IS_VERCEL:
+    load_dotenv()
+
+# Set once Config.init_app() has created the application folders
+_INIT_DONE = False
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    return int(_ENV.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    return float(_ENV.get(name, default))
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a true/false setting from the environment"""
+    value = _ENV.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() == 'true'
 
 
 class Config:
     """Base configuration class"""
     
     # OpenAI Configuration (GPT-4-turbo)
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4-turbo')
-    OPENAI_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', 0))
-    OPENAI_MAX_TOKENS = int(os.getenv('OPENAI_MAX_TOKENS', 4096))
+    OPENAI_API_KEY = _ENV.get('OPENAI_API_KEY')
+    OPENAI_MODEL = _ENV.get('OPENAI_MODEL', 'gpt-4-turbo')
+    OPENAI_TEMPERATURE = _env_float('OPENAI_TEMPERATURE', 0)
+    OPENAI_MAX_TOKENS = _env_int('OPENAI_MAX_TOKENS', 4096)
     
     # Application Configuration
-    DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    DEBUG = _env_bool('DEBUG')
     APP_NAME = "DCN Ai"
     VERSION = "1.0.0"
     
     # PDF Processing Settings
-    PDF_DPI = int(os.getenv('PDF_DPI', 300))
-    MAX_PAGES = int(os.getenv('MAX_PAGES', 50))
+    PDF_DPI = _env_int('PDF_DPI', 300)
+    MAX_PAGES = _env_int('MAX_PAGES', 50)
+    
+    # Dedicated threads for universal-extractor PDF work (parse, text, OCR)
+    PDF_POOL_SIZE = _env_int('PDF_POOL', os.cpu_count() or 4)
+    
+    # Worker processes for PyPDF text extraction on larger documents
+    PYPDF_PROCESSES = _env_int('PYPDF_PROCESSES', os.cpu_count() or 1)
+    
+    # Pages OCR'd at once (each runs its own Tesseract process)
+    OCR_CONCURRENCY = _env_int('OCR_CONCURRENCY', os.cpu_count() or 4)
+    
+    # Pages rendered per pdftoppm call during OCR (one process per batch)
+    OCR_RENDER_BATCH = _env_int('OCR_RENDER_BATCH', 8)
+    
+    # Widest page raster sent to OCR, in pixels (lowers DPI for large pages)
+    OCR_MAX_WIDTH = _env_int('OCR_MAX_WIDTH', 2000)
+    
+    # Binarize page images with OpenCV before OCR (when opencv is installed)
+    OCR_PREPROCESS = _env_bool('OCR_PREPROCESS', True)
+    
+    # Worker threads for blocking PDF work offloaded from the event loop
+    THREAD_POOL_SIZE = _env_int('THREAD_POOL_SIZE', 32)
+    
+    # Back-pressure: concurrent extractions, and how many may wait for a slot
+    MAX_INFLIGHT_EXTRACTIONS = _env_int('MAX_INFLIGHT_EXTRACTIONS', 4)
+    MAX_QUEUED_EXTRACTIONS = _env_int('MAX_QUEUED_EXTRACTIONS', 16)
+    
+    # Concurrent universal (LLM) extractions, to avoid bursting the model endpoint
+    UNIVERSAL_CONCURRENCY = _env_int('UNIVERSAL_CONCURRENCY', 4)
+    
+    # Bulk ACORD detection: files per request, and how many are detected at once
+    MAX_BULK_DETECT_FILES = _env_int('MAX_BULK_DETECT_FILES', 50)
+    BULK_DETECT_CONCURRENCY = _env_int('BULK_DETECT_CONCURRENCY', 8)
+    
+    # Concurrent AI organizer calls when organizing several ACORD forms at once
+    ORGANIZE_CONCURRENCY = _env_int('ORGANIZE_CONCURRENCY', 8)
     
     # File Configuration
-    BASE_DIR = Path(__file__).parent.parent
+    BASE_DIR = Path(_RESOLVED).parent.parent
     
-    # Vercel uses /tmp for writable storage (serverless environment)
-    # Check if running on Vercel - check multiple environment variables
-    IS_VERCEL = (
-        os.getenv('VERCEL') == '1' or 
-        os.getenv('VERCEL_ENV') is not None or
-        os.getenv('VERCEL_URL') is not None or
-        '/var/task' in str(Path(__file__).resolve())  # Vercel's serverless path
-    )
+    IS_VERCEL = IS_VERCEL
     
     if IS_VERCEL:
         UPLOAD_FOLDER = Path('/tmp/uploads')
         OUTPUT_FOLDER = Path('/tmp/output')
+        CACHE_FOLDER = Path('/tmp/cache')
     else:
         UPLOAD_FOLDER = BASE_DIR.parent / 'uploads'
         OUTPUT_FOLDER = BASE_DIR.parent / 'output'
+        CACHE_FOLDER = BASE_DIR.parent / 'cache'
+    
+    # In-memory entries kept by the extraction result cache
+    RESULT_CACHE_SIZE = _env_int('RESULT_CACHE_SIZE', 128)
+    
+    # On-disk extraction result cache bounds: entry count and age in seconds
+    RESULT_CACHE_DISK_ENTRIES = _env_int('RESULT_CACHE_DISK_ENTRIES', 1000)
+    RESULT_CACHE_MAX_AGE = _env_int('RESULT_CACHE_MAX_AGE', 7 * 24 * 3600)
+    
+    # Universal AI results kept in memory, keyed by a digest of the AI context
+    AI_RESULT_CACHE_SIZE = _env_int('AI_RESULT_CACHE_SIZE', 1024)
+    
+    # SQLite embedding cache; disable on read-only/ephemeral filesystems
+    EMBEDDING_CACHE_ENABLED = _env_bool('EMBEDDING_CACHE_ENABLED', True)
+    
+    # SQLite embedding cache bounds: row count and age in seconds
+    EMBEDDING_CACHE_MAX_ROWS = _env_int('EMBEDDING_CACHE_MAX_ROWS', 20000)
+    EMBEDDING_CACHE_MAX_AGE = _env_int('EMBEDDING_CACHE_MAX_AGE', 30 * 24 * 3600)
+    
+    # Reusable read buffers for streaming uploads to disk
+    UPLOAD_BUFFER_COUNT = _env_int('UPLOAD_BUFFER_COUNT', 8)
     
     # Maximum file size (50MB)
-    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 50 * 1024 * 1024))
+    MAX_CONTENT_LENGTH = _env_int('MAX_CONTENT_LENGTH', 50 * 1024 * 1024)
     
     # Allowed file extensions
     ALLOWED_EXTENSIONS = {'pdf'}
@@ -57,17 +142,19 @@ class Config:
     
     @classmethod
     def init_app(cls):
-        """Initialize application folders"""
-        try:
-            cls.UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
-            cls.OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            # On Vercel, /tmp folders are created on-demand
-            # If we can't create them now, they'll be created when needed
-            if cls.IS_VERCEL:
-                pass  # Expected in serverless - /tmp folders auto-create on first use
-            else:
-                raise e  # Re-raise if not on Vercel
+        """Initialize application folders (once per process)"""
+        global _INIT_DONE
+        if _INIT_DONE:
+            return
+        
+        # On Vercel, /tmp folders are created on-demand by the first
+        # upload/output write, so skip the work on cold start
+        if not cls.IS_VERCEL:
+            os.makedirs(cls.UPLOAD_FOLDER, exist_ok=True)
+            os.makedirs(cls.OUTPUT_FOLDER, exist_ok=True)
+            os.makedirs(cls.CACHE_FOLDER, exist_ok=True)
+        
+        _INIT_DONE = True
     
     @classmethod
     def validate_api_key(cls):
@@ -0,0 +1,60 @@
+"""
+Queued Application Logging
+
+Routes application log records through a QueueHandler so the actual
+stdout write happens on a background listener thread instead of on the
+request path.
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Parent of every module logger in the app (logging.getLogger(__name__))
+APP_LOGGER_NAME = "app"
+
+_listener = None
+_queue_handler = None
+
+
+def start_log_queue(level: int = logging.INFO):
+    """
+    Attach a queue handler to the app logger and start its listener.
+
+    Only the app's own loggers are routed through the queue; the root
+    logger and third-party library loggers (httpx, openai, ...) keep their
+    existing handlers and levels.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    _queue_handler = QueueHandler(log_queue)
+    app_logger.addHandler(_queue_handler)
+    app_logger.setLevel(level)
+    # Records are written by the listener; don't also pass them to root
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_log_queue():
+    """Flush pending records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    if _queue_handler is not None:
+        app_logger = logging.getLogger(APP_LOGGER_NAME)
+        app_logger.removeHandler(_queue_handler)
+        app_logger.propagate = True
+        _queue_handler = None
@@ -1,8 +1,8 @@
 """
 Pydantic models for request/response validation
 """
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List, Literal
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ValidationRule(BaseModel):
@@ -14,7 +14,9 @@ class ValidationRule(BaseModel):
 
 class ExtractionRequest(BaseModel):
     """Request schema for extraction endpoint"""
-    extraction_type: str = Field(
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
+    extraction_type: Literal["comprehensive", "simple", "custom"] = Field(
         default="comprehensive",
         description="Type of extraction: comprehensive, simple, or custom"
     )
@@ -26,13 +28,6 @@ class ExtractionRequest(BaseModel):
         default=300,
         description="DPI for PDF rendering"
     )
-    
-    @field_validator('extraction_type')
-    @classmethod
-    def validate_extraction_type(cls, v):
-        if v not in ['comprehensive', 'simple', 'custom']:
-            raise ValueError('extraction_type must be comprehensive, simple, or custom')
-        return v
 
 
 class ValidationRequest(BaseModel):
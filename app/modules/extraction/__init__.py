@@ -1,5 +1,5 @@
 # Extraction Module
 from app.modules.extraction.extraction_controller import ExtractionController
-from app.modules.extraction.extraction_service import ExtractionService
+from app.modules.extraction.extraction_service import ExtractionService, get_extraction_service
 
-__all__ = ["ExtractionController", "ExtractionService"]
+__all__ = ["ExtractionController", "ExtractionService", "get_extraction_service"]
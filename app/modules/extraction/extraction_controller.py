@@ -5,10 +5,77 @@ Handles HTTP request validation and response formatting.
 Delegates business logic to extraction service.
 """
 
+import asyncio
+import re
+from functools import wraps
+from typing import List, Optional
+
 from fastapi import UploadFile, BackgroundTasks
 
-from app.modules.extraction.extraction_service import ExtractionService
-from app.utils.response_utils import APIResponse, validation_error, server_error
+from app.config.config import Config
+from app.modules.extraction.extraction_service import get_extraction_service
+from app.utils.response_utils import (
+    ORJSONResponse,
+    APIResponse,
+    validation_error,
+    server_error,
+    server_busy_error,
+)
+
+
+_PDF_RX = re.compile(r'\.pdf\Z', re.IGNORECASE)
+
+# Back-pressure: each extraction can hold tens of MB (rendered pages, AI
+# payloads), so bound how many run at once and fail fast when the wait
+# queue is full instead of degrading every request
+_EXTRACTION_SEM = asyncio.Semaphore(Config.MAX_INFLIGHT_EXTRACTIONS)
+_queued_extractions = 0
+
+
+def _validate_pdf_upload(file: UploadFile) -> Optional[ORJSONResponse]:
+    """
+    Validate an uploaded file is a named PDF.
+    
+    Args:
+        file: Uploaded file (may be None)
+        
+    Returns:
+        Validation error response, or None if the upload is valid
+    """
+    if file is None:
+        return validation_error("No file provided. Please upload a PDF file.")
+    
+    if not file.filename:
+        return validation_error("Invalid file. Missing filename.")
+    
+    if not _PDF_RX.search(file.filename):
+        return validation_error("Invalid file type. Only PDF files are supported.")
+    
+    return None
+
+
+def validate_pdf_upload(action: str):
+    """
+    Decorate a controller handler with PDF upload validation and a shared
+    error epilogue.
+    
+    Args:
+        action: Label used in the server error message (e.g. "Extraction")
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(self, file: UploadFile, *args, **kwargs):
+            # Validate file presence and type
+            error = _validate_pdf_upload(file)
+            if error is not None:
+                return error
+            
+            try:
+                return await fn(self, file, *args, **kwargs)
+            except Exception as e:
+                return server_error(f"{action} failed: {str(e)}")
+        return wrapper
+    return decorator
 
 
 class ExtractionController:
@@ -24,8 +91,9 @@ class ExtractionController:
     
     def __init__(self):
         """Initialize controller with extraction service."""
-        self.service = ExtractionService()
+        self.service = get_extraction_service()
     
+    @validate_pdf_upload("Extraction")
     async def extract_data(
         self, 
         file: UploadFile, 
@@ -43,42 +111,45 @@ class ExtractionController:
         Returns:
             API response with extracted data
         """
-        # Validate file presence
-        if file is None:
-            return validation_error("No file provided. Please upload a PDF file.")
-        
-        # Validate file type
-        if not file.filename:
-            return validation_error("Invalid file. Missing filename.")
+        global _queued_extractions
+        if _EXTRACTION_SEM.locked() and _queued_extractions >= Config.MAX_QUEUED_EXTRACTIONS:
+            return server_busy_error()
         
-        if not file.filename.lower().endswith('.pdf'):
-            return validation_error("Invalid file type. Only PDF files are supported.")
+        _queued_extractions += 1
+        try:
+            await _EXTRACTION_SEM.acquire()
+        finally:
+            _queued_extractions -= 1
         
         try:
             # Call service for extraction
-            result = await self.service.extract_data(file, force_acord=force_acord)
-            
-            if not result.get("success"):
-                return server_error(result.get("error", "Extraction failed"))
-            
-            # Schedule file cleanup
-            if result.get("file_path"):
-                from app.utils.utils import cleanup_temp_file
-                background_tasks.add_task(cleanup_temp_file, result["file_path"])
-            
-            # Return success response
-            return APIResponse.extraction_success(
-                formatted_data=result.get("formatted_data", {}),
-                file_info=result.get("file_info", {}),
-                document_type=result.get("document_type", "Document"),
-                extraction_method=result.get("extraction_method", "unknown"),
-                tokens_used=result.get("tokens_used"),
-                json_file=result.get("json_file")
+            result = await self.service.extract_data(
+                file,
+                force_acord=force_acord,
+                background_tasks=background_tasks
             )
-            
-        except Exception as e:
-            return server_error(f"Extraction failed: {str(e)}")
+        finally:
+            _EXTRACTION_SEM.release()
+        
+        if not result.get("success"):
+            return server_error(result.get("error", "Extraction failed"))
+        
+        # Schedule file cleanup
+        if result.get("file_path"):
+            from app.utils.utils import cleanup_temp_file
+            background_tasks.add_task(cleanup_temp_file, result["file_path"])
+        
+        # Return success response
+        return APIResponse.extraction_success(
+            formatted_data=result.get("formatted_data", {}),
+            file_info=result.get("file_info", {}),
+            document_type=result.get("document_type", "Document"),
+            extraction_method=result.get("extraction_method", "unknown"),
+            tokens_used=result.get("tokens_used"),
+            json_file=result.get("json_file")
+        )
     
+    @validate_pdf_upload("Detection")
     async def detect_acord(
         self, 
         file: UploadFile, 
@@ -94,34 +165,83 @@ class ExtractionController:
         Returns:
             API response with detection results
         """
-        # Validate file presence
-        if file is None:
-            return validation_error("No file provided. Please upload a PDF file.")
+        # Call service for detection
+        result = await self.service.detect_acord(file)
         
-        # Validate file type
-        if not file.filename:
-            return validation_error("Invalid file. Missing filename.")
+        # Schedule file cleanup
+        if result.get("file_path"):
+            from app.utils.utils import cleanup_temp_file
+            background_tasks.add_task(cleanup_temp_file, result["file_path"])
         
-        if not file.filename.lower().endswith('.pdf'):
-            return validation_error("Invalid file type. Only PDF files are supported.")
+        # Unreadable uploads are errors, not "not ACORD" detections
+        if not result.get("success"):
+            return server_error(result.get("error") or "Detection failed")
         
-        try:
-            # Call service for detection
-            result = await self.service.detect_acord(file)
-            
-            # Schedule file cleanup
-            if result.get("file_path"):
-                from app.utils.utils import cleanup_temp_file
-                background_tasks.add_task(cleanup_temp_file, result["file_path"])
+        return APIResponse.detection_success(
+            is_acord=result.get("is_acord", False),
+            is_fillable=result.get("is_fillable", False),
+            confidence=result.get("confidence", "none"),
+            detected_form_type=result.get("detected_form_type"),
+            field_count=result.get("field_count", 0),
+            file_info=result.get("file_info", {})
+        )
+    
+    async def detect_acord_bulk(
+        self,
+        files: List[UploadFile],
+        background_tasks: BackgroundTasks
+    ) -> dict:
+        """
+        Detect ACORD forms for several PDFs in one request.
+        
+        Args:
+            files: Uploaded PDF files
+            background_tasks: FastAPI background tasks for cleanup
             
-            return APIResponse.detection_success(
-                is_acord=result.get("is_acord", False),
-                is_fillable=result.get("is_fillable", False),
-                confidence=result.get("confidence", "none"),
-                detected_form_type=result.get("detected_form_type"),
-                field_count=result.get("field_count", 0),
-                file_info=result.get("file_info", {})
+        Returns:
+            API response with one detection result per file
+        """
+        if not files:
+            return validation_error("No files provided. Please upload one or more PDF files.")
+        
+        if len(files) > Config.MAX_BULK_DETECT_FILES:
+            return validation_error(
+                f"Too many files. Maximum is {Config.MAX_BULK_DETECT_FILES} per request."
             )
-            
+        
+        # Validate every file before doing any work
+        for file in files:
+            error = _validate_pdf_upload(file)
+            if error is not None:
+                return error
+        
+        try:
+            results = await self.service.detect_acord_bulk(files)
         except Exception as e:
             return server_error(f"Detection failed: {str(e)}")
+        
+        # Schedule file cleanup
+        from app.utils.utils import cleanup_temp_file
+        for result in results:
+            if result.get("file_path"):
+                background_tasks.add_task(cleanup_temp_file, result["file_path"])
+        
+        return APIResponse.success(
+            data={
+                "count": len(results),
+                "results": [
+                    {
+                        "filename": result.get("filename"),
+                        "success": result.get("success", False),
+                        "is_acord": result.get("is_acord", False),
+                        "is_fillable": result.get("is_fillable", False),
+                        "confidence": result.get("confidence", "none"),
+                        "detected_form_type": result.get("detected_form_type"),
+                        "field_count": result.get("field_count", 0),
+                        "error": result.get("error")
+                    }
+                    for result in results
+                ]
+            },
+            message="Bulk document detection completed successfully"
+        )
@@ -7,17 +7,30 @@ Routes to appropriate pipeline based on document type:
 - Universal PDFs: AI-powered universal extraction
 """
 
+import asyncio
+import logging
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from fastapi import UploadFile
+from anyio import to_thread
+from fastapi import UploadFile, BackgroundTasks
 
-from app.utils.utils import save_upload_file, get_file_info, save_json_output
+from app.utils.utils import (
+    save_upload_file,
+    get_file_info,
+    save_json_output,
+    generate_output_filename,
+    compute_file_hash,
+)
+from app.utils.result_cache import get_result_cache
+from app.services.pypdf_extractor import open_pdf_reader
 from app.services.acord.acord_detector import detect_acord_form
 from app.services.acord.acord_pipeline import AcordExtractionPipeline
 from app.modules.universal.universal_extractor import get_universal_extractor
 from app.config.config import Config
 
+logger = logging.getLogger(__name__)
+
 
 class ExtractionService:
     """
@@ -32,11 +45,16 @@ class ExtractionService:
         """Initialize service components."""
         self.acord_pipeline = AcordExtractionPipeline()
         self.universal_extractor = get_universal_extractor()
+        self.result_cache = get_result_cache()
+        
+        # Caps concurrent LLM calls from the universal pipeline
+        self._universal_sem = asyncio.Semaphore(Config.UNIVERSAL_CONCURRENCY)
     
     async def extract_data(
         self, 
         file: UploadFile,
-        force_acord: bool = False
+        force_acord: bool = False,
+        background_tasks: Optional[BackgroundTasks] = None
     ) -> Dict[str, Any]:
         """
         Extract data from uploaded PDF file.
@@ -44,6 +62,8 @@ class ExtractionService:
         Args:
             file: Uploaded PDF file
             force_acord: Force ACORD pipeline even for non-ACORD forms
+            background_tasks: If given, the JSON output is written after
+                the response is sent instead of before
             
         Returns:
             Extraction result with formatted_data
@@ -57,14 +77,38 @@ class ExtractionService:
                 "error": file_path  # Contains error message in this case
             }
         
-        file_path = Path(file_path)
+        # save_upload_file returns a str; keep it for results and str-only
+        # callers instead of re-stringifying the Path each time
+        file_path_str = file_path
+        file_path = Path(file_path_str)
         
         # Get file info
-        file_info = get_file_info(file_path)
+        file_info = await to_thread.run_sync(get_file_info, file_path)
         
         try:
+            # Re-uploads of the same file skip detection and extraction
+            file_hash = await to_thread.run_sync(compute_file_hash, file_path)
+            cache_key = f"{file_hash}_acord" if force_acord else file_hash
+            
+            cached = await to_thread.run_sync(self.result_cache.get, cache_key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "formatted_data": cached.get("formatted_data", {}),
+                    "document_type": cached.get("document_type", "Document"),
+                    "extraction_method": f"{cached.get('extraction_method', 'unknown')}_cached",
+                    "tokens_used": None,
+                    "file_info": file_info,
+                    "file_path": file_path_str,
+                    "file_hash": file_hash
+                }
+            
+            # Parse the PDF once and share it between detection and the
+            # ACORD pipeline (PDF parsing runs off the event loop)
+            reader = await to_thread.run_sync(open_pdf_reader, file_path)
+            
             # Detect if ACORD form
-            detection = detect_acord_form(file_path)
+            detection = await to_thread.run_sync(detect_acord_form, file_path, reader)
             
             is_acord = detection.get("is_acord", False)
             is_fillable = detection.get("is_fillable", False)
@@ -72,22 +116,26 @@ class ExtractionService:
             # Route to appropriate pipeline
             if force_acord or (is_acord and is_fillable):
                 # Use ACORD hybrid pipeline
-                print("Using ACORD hybrid extraction pipeline")
-                result = self.acord_pipeline.process(file_path)
+                logger.info("Using ACORD hybrid extraction pipeline")
+                result = await to_thread.run_sync(
+                    self.acord_pipeline.process, file_path, reader, detection
+                )
                 document_type = "ACORD Form"
                 extraction_method = "acord_hybrid"
             else:
                 # Use universal extraction
-                print("Using Universal AI extraction pipeline")
-                result = await self.universal_extractor.extract_pdf(str(file_path))
+                logger.info("Using Universal AI extraction pipeline")
+                async with self._universal_sem:
+                    result = await self.universal_extractor.extract_pdf(file_path_str)
                 document_type = result.get("document_type", "Document")
-                extraction_method = "universal_ai"
+                # "form_fields_only" when the AI step failed
+                extraction_method = result.get("extraction_method", "universal_ai")
             
             if not result.get("success"):
                 return {
                     "success": False,
                     "error": result.get("error", "Extraction failed"),
-                    "file_path": str(file_path)
+                    "file_path": file_path_str
                 }
             
             # Prepare extraction result
@@ -98,13 +146,29 @@ class ExtractionService:
                 "extraction_method": extraction_method,
                 "tokens_used": result.get("tokens_used"),
                 "file_info": file_info,
-                "file_path": str(file_path)
+                "file_path": file_path_str,
+                "file_hash": file_hash
             }
             
-            # Save JSON output
-            save_success, json_file = save_json_output(extraction_result)
-            if save_success:
-                extraction_result["json_file"] = json_file
+            # Cache the payload for re-uploads of the same file. Results
+            # degraded by a failed AI step are not cached, so a re-upload
+            # retries the AI instead of being pinned to the partial result.
+            if result.get("ai_complete", True):
+                await to_thread.run_sync(self.result_cache.set, cache_key, {
+                    "formatted_data": extraction_result["formatted_data"],
+                    "document_type": document_type,
+                    "extraction_method": extraction_method
+                })
+            
+            # Save JSON output (off the request path when background tasks are available)
+            if background_tasks is not None:
+                json_filename = generate_output_filename()
+                background_tasks.add_task(save_json_output, dict(extraction_result), json_filename)
+                extraction_result["json_file"] = str(Config.OUTPUT_FOLDER / json_filename)
+            else:
+                save_success, json_file = await to_thread.run_sync(save_json_output, extraction_result)
+                if save_success:
+                    extraction_result["json_file"] = json_file
             
             return extraction_result
             
@@ -112,7 +176,7 @@ class ExtractionService:
             return {
                 "success": False,
                 "error": str(e),
-                "file_path": str(file_path)
+                "file_path": file_path_str
             }
     
     async def detect_acord(self, file: UploadFile) -> Dict[str, Any]:
@@ -136,13 +200,24 @@ class ExtractionService:
                 "error": file_path
             }
         
-        file_path = Path(file_path)
+        file_path_str = file_path
+        file_path = Path(file_path_str)
         
-        # Get file info
-        file_info = get_file_info(file_path)
-        
-        # Run detection
-        detection = detect_acord_form(file_path)
+        try:
+            # Get file info
+            file_info = await to_thread.run_sync(get_file_info, file_path)
+            
+            # Run detection (PDF parsing runs off the event loop)
+            detection = await to_thread.run_sync(detect_acord_form, file_path)
+        except Exception as e:
+            # Keep file_path so the caller still cleans up the upload
+            return {
+                "success": False,
+                "is_acord": False,
+                "is_fillable": False,
+                "error": f"Detection failed: {str(e)}",
+                "file_path": file_path_str
+            }
         
         return {
             "success": True,
@@ -152,5 +227,48 @@ class ExtractionService:
             "detected_form_type": detection.get("detected_form_type"),
             "field_count": detection.get("field_count", 0),
             "file_info": file_info,
-            "file_path": str(file_path)
+            "file_path": file_path_str
         }
+    
+    async def detect_acord_bulk(self, files: List[UploadFile]) -> List[Dict[str, Any]]:
+        """
+        Detect ACORD forms across several uploaded PDFs concurrently.
+        
+        Args:
+            files: Uploaded PDF files
+            
+        Returns:
+            Detection results, in the same order as files
+        """
+        sem = asyncio.Semaphore(Config.BULK_DETECT_CONCURRENCY)
+        
+        async def detect_one(file: UploadFile) -> Dict[str, Any]:
+            # One failing file yields an error entry instead of failing the
+            # whole batch (and leaving the other uploads behind)
+            try:
+                async with sem:
+                    result = await self.detect_acord(file)
+            except Exception as e:
+                logger.error(f"Bulk detection failed for {file.filename}: {e}")
+                result = {
+                    "success": False,
+                    "is_acord": False,
+                    "is_fillable": False,
+                    "error": str(e)
+                }
+            result["filename"] = file.filename
+            return result
+        
+        return await asyncio.gather(*(detect_one(file) for file in files))
+
+
+# Singleton instance
+_extraction_service = None
+
+
+def get_extraction_service() -> ExtractionService:
+    """Get or create extraction service singleton"""
+    global _extraction_service
+    if _extraction_service is None:
+        _extraction_service = ExtractionService()
+    return _extraction_service
@@ -4,12 +4,13 @@ Extraction Routes
 Single unified API endpoint for all document extraction:
 - POST /api/extract-data - Auto-detects ACORD vs Universal
 
-Detection endpoint (optional):
+Detection endpoints (optional):
 - POST /api/detect-acord - Check if PDF is ACORD form
+- POST /api/detect-acord/bulk - Check several PDFs in one request
 """
 
 from fastapi import APIRouter, UploadFile, File, BackgroundTasks
-from typing import Optional
+from typing import List, Optional
 
 from app.modules.extraction.extraction_controller import ExtractionController
 
@@ -66,6 +67,20 @@ async def detect_acord(
     return await controller.detect_acord(uploaded_file, background_tasks)
 
 
+@router.post("/detect-acord/bulk")
+async def detect_acord_bulk(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...)
+):
+    """
+    Detect ACORD forms for several PDFs in one request.
+    
+    Files are detected concurrently. Returns one result per file, in upload
+    order, with the same detection info as /api/detect-acord.
+    """
+    return await controller.detect_acord_bulk(files, background_tasks)
+
+
 # Legacy endpoints for backwards compatibility (deprecated)
 @router.post("/extract", deprecated=True)
 async def extract_legacy(
@@ -1,21 +1,28 @@
 """
 Universal PDF Extractor
 
-Extracts data from any PDF using parallel PyPDF + OCR processing.
+Extracts data from any PDF using PyPDF, with parallel OCR as a fallback.
 Uses GPT-4-turbo for intelligent data organization.
 """
+import io
+import re
+import copy
 import asyncio
+import hashlib
 import logging
+import threading
+import multiprocessing
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque, OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 # PDF processing
 from pypdf import PdfReader
 
 # Try to import OCR dependencies (optional)
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     from PIL import Image
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
@@ -29,25 +36,179 @@ except ImportError:
     PYTESSERACT_AVAILABLE = False
     print("Warning: pytesseract not installed. OCR features disabled.")
 
+# PDFium (C++) extracts text several times faster than PyPDF when installed
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# OpenCV is only used to clean up page images before OCR
+try:
+    import cv2
+    import numpy as np
+    OPENCV_AVAILABLE = True
+except ImportError:
+    OPENCV_AVAILABLE = False
+
+from anyio import to_thread
+
 from app.config.config import Config
 from app.services.ai.openai_service import get_openai_service
 
+logger = logging.getLogger(__name__)
+
 # Suppress PyPDF warnings
 logging.getLogger("pypdf").setLevel(logging.ERROR)
 
+# Form field classification by /FT type: (value, /Ff flags) -> (bucket, value)
+_FIELD_HANDLERS = {
+    "/Tx": lambda v, ff: ("text_fields", v or ""),  # Text field
+    "/Ch": lambda v, ff: ("dropdowns", v or ""),  # Choice (dropdown)
+    "/Btn": lambda v, ff: (  # Button (radio if flag bit 16 set, else checkbox)
+        ("radio_buttons", v or "") if ff & 0x8000
+        else ("checkboxes", bool(v and v != "Off"))
+    ),
+}
+
+# Field name cleanup for the AI context: drop brackets, dots become spaces
+_FIELD_NAME_CLEANUP = str.maketrans({'[': None, ']': None, '.': ' '})
+
+# Width/height in points from pdfinfo's "Page size", e.g. "612 x 792 pts (letter)"
+_PAGE_SIZE_RE = re.compile(r'([\d.]+) x ([\d.]+)')
+
+# Documents shorter than this are extracted inline; process startup and
+# re-parsing the PDF in each worker would cost more than it saves
+MIN_PAGES_FOR_PROCESS_POOL = 4
+
+# Process pool for CPU-bound PyPDF text extraction (created on first use)
+_text_process_pool = None
+
+# PDFium is not thread-safe: every pdfium call (open, text pages, close)
+# from any thread goes through this lock
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _get_text_process_pool() -> ProcessPoolExecutor:
+    """Get or create the PyPDF text extraction process pool"""
+    global _text_process_pool
+    if _text_process_pool is None:
+        # Never fork the server process: it already runs threads (anyio
+        # workers, the log listener, the HTTP client) whose held locks
+        # would be inherited by the children and could deadlock them
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _text_process_pool = ProcessPoolExecutor(
+            max_workers=Config.PYPDF_PROCESSES,
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _text_process_pool
+
+
+def close_text_process_pool():
+    """Shut down the PyPDF text extraction process pool"""
+    global _text_process_pool
+    if _text_process_pool is not None:
+        _text_process_pool.shutdown(wait=False, cancel_futures=True)
+        _text_process_pool = None
+
+
+def _extract_page_texts_from_path(pdf_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Extract text for a contiguous range of pages in a worker process.
+    
+    Each call parses the PDF once for its whole range. The worker reads
+    the file itself, so only the path is pickled per task.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+    
+    Returns:
+        List of (page_index, text) tuples
+    """
+    return _extract_page_texts(PdfReader(pdf_path), start, stop)
+
+
+def _extract_page_texts(pdf_reader: PdfReader, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Extract text for a contiguous range of pages.
+    
+    Args:
+        pdf_reader: Parsed PDF
+        start: First page index (inclusive)
+        stop: Last page index (exclusive)
+    
+    Returns:
+        List of (page_index, text) tuples
+    """
+    results = []
+    for i in range(start, stop):
+        try:
+            results.append((i, pdf_reader.pages[i].extract_text()))
+        except Exception as page_error:
+            print(f"Warning: Could not extract text from page {i + 1}: {str(page_error)}")
+    return results
+
 
 class UniversalPDFExtractor:
     """
     Universal PDF extractor with parallel processing.
     
     Uses PyPDF for direct text extraction, with OCR fallback for
-    scanned documents. Both run in parallel for speed.
+    scanned documents. OCR only runs when PyPDF finds no usable text.
     """
     
+    # PDF work gets its own threads so it doesn't queue behind (or starve)
+    # everything else using the default executor
+    _pool = ThreadPoolExecutor(
+        max_workers=Config.PDF_POOL_SIZE,
+        thread_name_prefix="pdf"
+    )
+    
     def __init__(self, config=None):
         """Initialize the PDF extractor"""
         self.config = config or Config
         self.openai_service = None  # Lazy initialization
+        
+        # Successful AI results by context digest, so re-extracting the same
+        # document skips the LLM call
+        self._ai_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ai_cache_lock = threading.Lock()
+    
+    def _extract_universal_data_cached(self, ai_context: str) -> Dict[str, Any]:
+        """
+        Run the AI extraction, reusing the result for an identical context.
+        
+        Args:
+            ai_context: Text and form fields sent to the model
+        
+        Returns:
+            AI result dict (only successful results are cached). Cached
+            entries are stored and returned as deep copies, so callers can
+            mutate the result without corrupting later hits.
+        """
+        digest = hashlib.blake2b(
+            f"{self.config.OPENAI_MODEL}\n{ai_context}".encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        
+        with self._ai_cache_lock:
+            cached = self._ai_cache.get(digest)
+            if cached is not None:
+                self._ai_cache.move_to_end(digest)
+                logger.info("Using cached AI extraction result")
+                return copy.deepcopy(cached)
+        
+        ai_result = self.openai_service.extract_universal_data(ai_context)
+        
+        if ai_result.get("success"):
+            with self._ai_cache_lock:
+                self._ai_cache[digest] = copy.deepcopy(ai_result)
+                while len(self._ai_cache) > self.config.AI_RESULT_CACHE_SIZE:
+                    self._ai_cache.popitem(last=False)
+        
+        return ai_result
     
     async def extract_pdf(
         self,
@@ -78,17 +239,22 @@ class UniversalPDFExtractor:
                     "error": "PDF file not found"
                 }
             
-            # Extract form fields directly (fast, synchronous)
-            form_fields = self._extract_form_fields(pdf_path)
-            
-            page_count = 0
-            
             # Use run_in_executor for parallel processing
             loop = asyncio.get_event_loop()
             
+            # Read and parse the PDF once; the helpers share the reader
+            pdf_bytes, pdf_reader = await loop.run_in_executor(
+                self._pool, self._open_pdf, pdf_path
+            )
+            
+            # Extract form fields directly (fast, synchronous)
+            form_fields = self._extract_form_fields(pdf_reader)
+            
+            page_count = len(pdf_reader.pages) if pdf_reader is not None else 0
+            
             def run_pypdf():
                 """Extract text using PyPDF"""
-                text = self._extract_text_directly(pdf_path)
+                text = self._extract_text_directly(pdf_bytes, pdf_reader, pdf_path)
                 print(f"PyPDF extraction: {len(text)} characters")
                 return text
             
@@ -97,39 +263,28 @@ class UniversalPDFExtractor:
                 if not PDF2IMAGE_AVAILABLE or not PYTESSERACT_AVAILABLE:
                     return "", 0
                 
-                images = self._convert_pdf_to_images(pdf_path, dpi)
-                if not images:
+                ocr_text, pages_rendered = self._ocr_pdf(pdf_path, dpi)
+                if not pages_rendered:
                     return "", 0
                 
-                ocr_text = self._extract_text_from_images(images)
                 print(f"OCR extraction: {len(ocr_text)} characters")
-                return ocr_text, len(images)
-            
-            # Run PyPDF and OCR in parallel
-            pypdf_task = loop.run_in_executor(None, run_pypdf)
-            ocr_task = loop.run_in_executor(None, run_ocr)
+                return ocr_text, pages_rendered
             
-            # Wait for PyPDF first (usually faster)
-            direct_text = await pypdf_task
+            # PyPDF first; OCR only starts if it comes back (nearly) empty, so
+            # text PDFs never pay for rendering and Tesseract
+            direct_text = await loop.run_in_executor(self._pool, run_pypdf)
             
             ocr_text = ""
             full_text = ""
             
-            # Smart selection: Use PyPDF if successful, otherwise wait for OCR
+            # Smart selection: Use PyPDF if successful, otherwise fall back to OCR
             if direct_text and len(direct_text.strip()) > 50:
                 print("Using PyPDF text extraction (successful)")
                 full_text = direct_text
-                
-                # Get page count from PyPDF
-                try:
-                    with open(pdf_path, 'rb') as f:
-                        page_count = len(PdfReader(f).pages)
-                except:
-                    page_count = 1
             else:
-                # PyPDF failed, wait for OCR
-                print("PyPDF insufficient, waiting for OCR...")
-                ocr_result = await ocr_task
+                # PyPDF failed, run OCR
+                print("PyPDF insufficient, running OCR...")
+                ocr_result = await loop.run_in_executor(self._pool, run_ocr)
                 
                 if isinstance(ocr_result, tuple):
                     ocr_text, page_count = ocr_result
@@ -149,33 +304,42 @@ class UniversalPDFExtractor:
                     "error": "No text could be extracted. Document may be image-only without readable text."
                 }
             
-            # Build context for AI
-            ai_context = ""
+            # Build context for AI in a single growing buffer
+            buf = io.StringIO()
+            write = buf.write
             
             if full_text and full_text.strip():
-                ai_context += "=== DOCUMENT TEXT ===\n"
-                ai_context += full_text + "\n\n"
+                write("=== DOCUMENT TEXT ===\n")
+                write(full_text)
+                write("\n\n")
             
             # Add form fields if they exist
             if form_fields and form_fields.get('text_fields'):
-                ai_context += "=== FORM FIELD VALUES ===\n"
+                write("=== FORM FIELD VALUES ===\n")
                 for field_name, field_value in form_fields.get('text_fields', {}).items():
-                    clean_name = field_name.replace('[', '').replace(']', '').replace('.', ' ')
-                    ai_context += f"{clean_name}: {field_value}\n"
-                ai_context += "\n"
+                    clean_name = field_name.translate(_FIELD_NAME_CLEANUP)
+                    write(f"{clean_name}: {field_value}\n")
+                write("\n")
             
             if form_fields and form_fields.get('checkboxes'):
-                ai_context += "=== CHECKBOX VALUES ===\n"
+                write("=== CHECKBOX VALUES ===\n")
                 for cb_name, cb_value in form_fields.get('checkboxes', {}).items():
-                    clean_name = cb_name.replace('[', '').replace(']', '').replace('.', ' ')
+                    clean_name = cb_name.translate(_FIELD_NAME_CLEANUP)
                     status = "CHECKED" if cb_value else "UNCHECKED"
-                    ai_context += f"{clean_name}: {status}\n"
-                ai_context += "\n"
+                    write(f"{clean_name}: {status}\n")
+                write("\n")
+            
+            ai_context = buf.getvalue()
             
             print(f"Sending {len(ai_context)} characters to GPT-4o...")
             
-            # Use OpenAI to extract and organize data
-            ai_result = self.openai_service.extract_universal_data(ai_context)
+            # Use OpenAI to extract and organize data. Run the blocking call in
+            # a worker thread (bounded by the anyio limiter sized from
+            # Config.THREAD_POOL_SIZE) so concurrent requests share the
+            # client's connection pool instead of serializing on the event loop.
+            ai_result = await to_thread.run_sync(
+                self._extract_universal_data_cached, ai_context
+            )
             
             if not ai_result.get("success"):
                 # If AI fails, fall back to raw form fields
@@ -185,7 +349,8 @@ class UniversalPDFExtractor:
                         "success": True,
                         "formatted_data": form_fields,
                         "document_type": "Unknown",
-                        "extraction_method": "form_fields_only"
+                        "extraction_method": "form_fields_only",
+                        "ai_complete": False
                     }
                 return ai_result
             
@@ -210,7 +375,8 @@ class UniversalPDFExtractor:
                 "tokens_used": ai_result.get("usage", {}),
                 "model": self.config.OPENAI_MODEL,
                 "extraction_method": "universal_ai",
-                "page_count": page_count
+                "page_count": page_count,
+                "ai_complete": True
             }
             
         except Exception as e:
@@ -219,23 +385,115 @@ class UniversalPDFExtractor:
                 "error": f"PDF extraction failed: {str(e)}"
             }
     
-    def _extract_text_directly(self, pdf_path: str) -> str:
-        """Extract text directly from PDF using PyPDF"""
+    def _open_pdf(self, pdf_path: str) -> Tuple[bytes, Optional[PdfReader]]:
+        """
+        Read a PDF into memory and parse it once.
+        
+        Returns:
+            Tuple of (pdf_bytes, pdf_reader); pdf_reader is None if PyPDF
+            cannot parse the file, leaving OCR as the only text source
+        """
+        pdf_bytes = Path(pdf_path).read_bytes()
         try:
-            all_text = []
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_reader = PdfReader(pdf_file)
-                num_pages = min(len(pdf_reader.pages), self.config.MAX_PAGES)
-                
-                for i in range(num_pages):
+            return pdf_bytes, PdfReader(io.BytesIO(pdf_bytes))
+        except Exception as e:
+            print(f"Error reading PDF: {str(e)}")
+            return pdf_bytes, None
+    
+    def _extract_text_pdfium(self, pdf_bytes: bytes) -> Optional[str]:
+        """
+        Extract text with PDFium.
+        
+        Runs entirely under _PDFIUM_LOCK, so concurrent requests extract
+        one document at a time.
+        
+        Returns:
+            Page-delimited text, or None if PDFium could not read the file
+        """
+        with _PDFIUM_LOCK:
+            try:
+                pdf = pdfium.PdfDocument(pdf_bytes)
+            except Exception as e:
+                print(f"Warning: PDFium could not open PDF, using PyPDF: {str(e)}")
+                return None
+            
+            try:
+                all_text = []
+                for i in range(min(len(pdf), self.config.MAX_PAGES)):
                     try:
-                        page = pdf_reader.pages[i]
-                        text = page.extract_text()
-                        if text and text.strip():
-                            all_text.append(f"--- PAGE {i + 1} ---\n{text}\n")
+                        page = pdf[i]
+                        textpage = page.get_textpage()
+                        text = textpage.get_text_range().replace('\r\n', '\n')
+                        textpage.close()
+                        page.close()
                     except Exception as page_error:
                         print(f"Warning: Could not extract text from page {i + 1}: {str(page_error)}")
                         continue
+                    
+                    if text and text.strip():
+                        all_text.append(f"--- PAGE {i + 1} ---\n{text}\n")
+                
+                return "\n".join(all_text)
+            finally:
+                pdf.close()
+    
+    def _extract_text_directly(
+        self,
+        pdf_bytes: bytes,
+        pdf_reader: Optional[PdfReader],
+        pdf_path: Optional[str] = None
+    ) -> str:
+        """
+        Extract text directly from PDF.
+        
+        Larger documents (MIN_PAGES_FOR_PROCESS_POOL pages or more, with
+        pdf_path and more than one PYPDF_PROCESSES worker) go to the PyPDF
+        process pool, which scales across cores. Shorter ones use PDFium when
+        it is installed, since its speed wins there and its global lock is
+        held only briefly; PyPDF runs inline otherwise, or if PDFium fails.
+        """
+        num_pages = min(len(pdf_reader.pages), self.config.MAX_PAGES) if pdf_reader is not None else 0
+        workers = min(self.config.PYPDF_PROCESSES, num_pages)
+        use_process_pool = bool(pdf_path) and num_pages >= MIN_PAGES_FOR_PROCESS_POOL and workers > 1
+        
+        if PDFIUM_AVAILABLE and not use_process_pool:
+            text = self._extract_text_pdfium(pdf_bytes)
+            if text is not None:
+                return text
+        
+        if pdf_reader is None:
+            return ""
+        
+        try:
+            page_texts = None
+            
+            # Pages are independent, so larger documents are split into one
+            # contiguous range per worker process
+            if use_process_pool:
+                step = -(-num_pages // workers)
+                try:
+                    pool = _get_text_process_pool()
+                    futures = [
+                        pool.submit(
+                            _extract_page_texts_from_path,
+                            str(pdf_path), start, min(start + step, num_pages)
+                        )
+                        for start in range(0, num_pages, step)
+                    ]
+                    page_texts = [item for future in futures for item in future.result()]
+                except Exception as pool_error:
+                    print(f"Warning: Parallel text extraction failed, running inline: {str(pool_error)}")
+                    # A broken pool stays broken; recreate it on the next call
+                    close_text_process_pool()
+            
+            if page_texts is None:
+                page_texts = _extract_page_texts(pdf_reader, 0, num_pages)
+            
+            all_text = [
+                f"--- PAGE {i + 1} ---\n{text}\n"
+                for i, text in page_texts
+                if text and text.strip()
+            ]
             
             return "\n".join(all_text)
             
@@ -243,81 +501,166 @@ class UniversalPDFExtractor:
             print(f"Error extracting text directly from PDF: {str(e)}")
             return ""
     
-    def _convert_pdf_to_images(self, pdf_path: str, dpi: int) -> List:
-        """Convert PDF pages to images for OCR"""
-        if not PDF2IMAGE_AVAILABLE:
-            return []
+    def _preprocess_for_ocr(self, image):
+        """
+        Binarize a page image before OCR.
         
+        Grayscale -> light Gaussian blur -> adaptive threshold. Clean
+        single-channel input speeds up Tesseract's layout analysis and
+        improves recognition on scans with uneven lighting.
+        """
+        pixels = np.asarray(image.convert('L'))
+        pixels = cv2.GaussianBlur(pixels, (3, 3), 0)
+        return cv2.adaptiveThreshold(
+            pixels, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        )
+    
+    def _ocr_image(self, page_number: int, image) -> str:
+        """OCR a single page image, returning "" if Tesseract fails"""
+        try:
+            if OPENCV_AVAILABLE and self.config.OCR_PREPROCESS:
+                image = self._preprocess_for_ocr(image)
+            return pytesseract.image_to_string(image)
+        except Exception as ocr_error:
+            print(f"Warning: OCR failed for page {page_number}: {str(ocr_error)}")
+            return ""
+    
+    def _ocr_dpi(self, pdf_info: Dict[str, Any], dpi: int) -> int:
+        """
+        Lower the render DPI so the page raster stays within OCR_MAX_WIDTH.
+        
+        Tesseract time grows with pixel count, so large pages (A3, tabloid)
+        are rendered at a lower DPI than letter-size ones.
+        
+        Args:
+            pdf_info: Result of pdfinfo_from_path
+            dpi: Requested DPI
+        
+        Returns:
+            DPI to render at
+        """
+        match = _PAGE_SIZE_RE.search(str(pdf_info.get("Page size", "")))
+        if not match:
+            return dpi
+        
+        page_width_pts = float(match.group(1))
+        if page_width_pts <= 0:
+            return dpi
+        
+        max_dpi = int(self.config.OCR_MAX_WIDTH * 72 / page_width_pts)
+        return max(72, min(dpi, max_dpi))
+    
+    def _render_pages(self, pdf_path: str, dpi: int, first_page: int, last_page: int) -> List[Tuple[int, Any]]:
+        """
+        Render a range of pages with one pdftoppm call.
+        
+        If the batch fails, its pages are retried one at a time so a single
+        bad page doesn't drop the rest of the batch.
+        
+        Returns:
+            List of (page_number, image) tuples
+        """
+        # Grayscale JPEG rasters are a fraction of the size of RGB PPM and
+        # OCR just as well for text
+        options = {"dpi": dpi, "fmt": 'jpeg', "grayscale": True}
         try:
-            max_pages = self.config.MAX_PAGES
             images = convert_from_path(
-                pdf_path,
-                dpi=dpi,
-                first_page=1,
-                last_page=max_pages
+                pdf_path, first_page=first_page, last_page=last_page, **options
             )
-            return images
+            return list(zip(range(first_page, last_page + 1), images))
+        except Exception as render_error:
+            if first_page == last_page:
+                print(f"Warning: Could not render page {first_page}: {str(render_error)}")
+                return []
+        
+        rendered = []
+        for page_number in range(first_page, last_page + 1):
+            rendered.extend(self._render_pages(pdf_path, dpi, page_number, page_number))
+        return rendered
+    
+    def _ocr_pdf(self, pdf_path: str, dpi: int) -> Tuple[str, int]:
+        """
+        Render and OCR a PDF in page batches.
+        
+        Each batch of OCR_RENDER_BATCH pages is rendered by one pdftoppm
+        process and handed to OCR threads as soon as it is ready, so OCR of
+        one batch overlaps rendering of the next. Rendering waits while the
+        rendered-but-unfinished images would exceed the in-flight bound.
+        
+        Returns:
+            Tuple of (ocr_text, pages_rendered)
+        """
+        try:
+            pdf_info = pdfinfo_from_path(pdf_path)
+            total_pages = pdf_info["Pages"]
         except Exception as e:
             print(f"Error converting PDF to images: {str(e)}")
-            return []
-    
-    def _extract_text_from_images(self, images: List) -> str:
-        """Extract text from images using OCR"""
-        if not PYTESSERACT_AVAILABLE:
-            return ""
+            return "", 0
+        
+        num_pages = min(total_pages, self.config.MAX_PAGES)
+        dpi = self._ocr_dpi(pdf_info, dpi)
+        workers = max(1, min(self.config.OCR_CONCURRENCY, num_pages))
+        batch_size = max(1, self.config.OCR_RENDER_BATCH)
+        max_in_flight = max(workers * 2, batch_size)
+        
+        page_futures = []
+        in_flight = deque()
         
         try:
-            all_text = []
-            for i, image in enumerate(images, 1):
-                try:
-                    text = pytesseract.image_to_string(image)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for first_page in range(1, num_pages + 1, batch_size):
+                    last_page = min(first_page + batch_size - 1, num_pages)
+                    
+                    # Wait for the oldest pages before rendering more
+                    while in_flight and len(in_flight) + (last_page - first_page + 1) > max_in_flight:
+                        in_flight.popleft().result()
+                    
+                    rendered = self._render_pages(pdf_path, dpi, first_page, last_page)
+                    
+                    for page_number, image in rendered:
+                        future = executor.submit(self._ocr_image, page_number, image)
+                        page_futures.append((page_number, future))
+                        in_flight.append(future)
+                    del rendered
+                
+                all_text = []
+                for page_number, future in page_futures:
+                    text = future.result()
                     if text.strip():
-                        all_text.append(f"--- PAGE {i} ---\n{text}\n")
-                except Exception as ocr_error:
-                    print(f"Warning: OCR failed for page {i}: {str(ocr_error)}")
-                    continue
+                        all_text.append(f"--- PAGE {page_number} ---\n{text}\n")
             
-            return "\n".join(all_text)
+            return "\n".join(all_text), len(page_futures)
             
         except Exception as e:
             print(f"Error extracting text from images: {str(e)}")
-            return ""
+            return "", 0
     
-    def _extract_form_fields(self, pdf_path: str) -> Dict[str, Any]:
+    def _extract_form_fields(self, pdf_reader: Optional[PdfReader]) -> Dict[str, Any]:
         """Extract form fields directly from PDF"""
+        if pdf_reader is None:
+            return {}
+        
         try:
-            with open(pdf_path, 'rb') as pdf_file:
-                pdf_reader = PdfReader(pdf_file)
-                
-                if not pdf_reader.get_fields():
-                    return {}
-                
-                text_fields = {}
-                checkboxes = {}
-                radio_buttons = {}
-                dropdowns = {}
-                
-                for field_name, field in pdf_reader.get_fields().items():
-                    field_type = field.get("/FT")
-                    field_value = field.get("/V")
-                    
-                    if field_type == "/Tx":  # Text field
-                        text_fields[field_name] = field_value or ""
-                    elif field_type == "/Ch":  # Choice (dropdown)
-                        dropdowns[field_name] = field_value or ""
-                    elif field_type == "/Btn":  # Button (checkbox/radio)
-                        flags = field.get("/Ff", 0)
-                        if flags & 0x8000:  # Radio button
-                            radio_buttons[field_name] = field_value or ""
-                        else:  # Checkbox
-                            checkboxes[field_name] = bool(field_value and field_value != "Off")
-                
-                return {
-                    "text_fields": text_fields,
-                    "checkboxes": checkboxes,
-                    "radio_buttons": radio_buttons,
-                    "dropdowns": dropdowns
-                }
+            fields = pdf_reader.get_fields()
+            
+            if not fields:
+                return {}
+            
+            buckets = {
+                "text_fields": {},
+                "checkboxes": {},
+                "radio_buttons": {},
+                "dropdowns": {}
+            }
+            handlers = _FIELD_HANDLERS
+            
+            for field_name, field in fields.items():
+                handler = handlers.get(field.get("/FT"))
+                if handler is not None:
+                    bucket, value = handler(field.get("/V"), field.get("/Ff", 0))
+                    buckets[bucket][field_name] = value
+            
+            return buckets
         
         except Exception as e:
             print(f"Error extracting form fields: {str(e)}")
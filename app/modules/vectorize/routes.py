@@ -1,11 +1,11 @@
 """Vectorize routes."""
 from fastapi import APIRouter, Depends, File, UploadFile
-from fastapi.responses import JSONResponse
 
+from app.utils.response_utils import ORJSONResponse
 from app.modules.vectorize.vectorize_schemas import VectorizeQueryRequest
 from app.modules.vectorize.vectorize_controller import VectorizeController, get_vectorize_controller
 
-router = APIRouter(prefix='/api', tags=['vectorize'])
+router = APIRouter(prefix='/api', tags=['vectorize'], default_response_class=ORJSONResponse)
 
 
 @router.post('/vectorize')
@@ -16,7 +16,7 @@ async def vectorize(
     """Vectorize a single uploaded PDF into chunk-level embeddings."""
     result = await controller.vectorize_pdf(file)
     status_code = 200 if result.get('success') else 400
-    return JSONResponse(status_code=status_code, content=result)
+    return ORJSONResponse(status_code=status_code, content=result)
 
 
 @router.post('/vectorize-query')
@@ -27,4 +27,4 @@ async def vectorize_query(
     """Vectorize query text using the same embedding model used for document chunks."""
     result = await controller.vectorize_query(request.query)
     status_code = 200 if result.get('success') else 400
-    return JSONResponse(status_code=status_code, content=result)
+    return ORJSONResponse(status_code=status_code, content=result)
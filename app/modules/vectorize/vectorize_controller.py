@@ -22,6 +22,8 @@ class VectorizeController:
         return self._service
 
     async def vectorize_pdf(self, file: UploadFile) -> Dict[str, Any]:
+        # One timestamp per request, shared by the response and its chunks
+        timestamp = datetime.now(timezone.utc).isoformat()
         try:
             if file is None:
                 raise ValueError("No file provided")
@@ -32,28 +34,29 @@ class VectorizeController:
             if not file.filename.lower().endswith('.pdf'):
                 raise ValueError("Invalid file type. Only PDF files are supported")
 
-            result = await self.service.vectorize_pdf(file)
-            result['timestamp'] = datetime.now(timezone.utc).isoformat()
+            result = await self.service.vectorize_pdf(file, created_at=timestamp)
+            result['timestamp'] = timestamp
             return result
         except Exception as e:
             logger.error(f"Vectorization failed: {e}")
             return {
                 'success': False,
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': timestamp
             }
 
     async def vectorize_query(self, query: str) -> Dict[str, Any]:
+        timestamp = datetime.now(timezone.utc).isoformat()
         try:
-            result = self.service.vectorize_query(query)
-            result['timestamp'] = datetime.now(timezone.utc).isoformat()
+            result = await self.service.vectorize_query(query, created_at=timestamp)
+            result['timestamp'] = timestamp
             return result
         except Exception as e:
             logger.error(f"Query vectorization failed: {e}")
             return {
                 'success': False,
                 'error': str(e),
-                'timestamp': datetime.now(timezone.utc).isoformat()
+                'timestamp': timestamp
             }
 
 
@@ -1,27 +1,207 @@
 """Service for PDF and query vectorization."""
+import asyncio
+import io
 import os
 from datetime import datetime, timezone
-from hashlib import sha256
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
+from anyio import to_thread
 from fastapi import UploadFile
 
-from app.services.ai.embedding_service import get_embedding_service
-from app.modules.extraction.extraction_service import ExtractionService
+from app.services.ai.embedding_service import EmbeddingService, get_embedding_service
+from app.services.ai.embedding_cache import get_embedding_cache
+from app.modules.extraction.extraction_service import get_extraction_service
 from app.utils.utils import cleanup_file
 
 
+class QueryBatcher:
+    """
+    Coalesces concurrent single-text embedding requests.
+
+    Texts submitted within max_wait_ms of the first queued one (up to
+    max_batch) are embedded with one call and the vectors fanned back out
+    to the waiting callers.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[List[str]], List[List[float]]],
+        max_batch: int = 32,
+        max_wait_ms: float = 20.0
+    ):
+        self._embed = embed
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # The queue and worker belong to the running loop; recreate them
+        # if the previous worker is gone (e.g. a new loop)
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def submit(self, text: str) -> List[float]:
+        """Queue text for the next batch and wait for its embedding."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush(batch)
+            except asyncio.CancelledError:
+                self._fail(batch, RuntimeError("Query batcher stopped"))
+                raise
+            except Exception as e:
+                # Keep the worker alive; only this batch's callers see the error
+                self._fail(batch, e)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        pending = [(text, future) for text, future in batch if not future.done()]
+        if not pending:
+            return
+
+        vectors = await to_thread.run_sync(
+            self._embed, [text for text, _ in pending]
+        )
+        if len(vectors) != len(pending):
+            raise RuntimeError(
+                f"Embedding returned {len(vectors)} vectors for {len(pending)} queries"
+            )
+
+        for (_, future), vector in zip(pending, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[str, asyncio.Future]], error: BaseException) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
 class VectorizeService:
     """Service layer for vectorization-only APIs."""
 
     CHUNK_SIZE = 1200
     CHUNK_OVERLAP = 150
 
+    # Large chunk lists are embedded as concurrent sub-batches
+    EMBED_WORKERS = int(os.getenv("VECTORIZE_EMBED_WORKERS", "8"))
+    EMBED_BATCH = int(os.getenv("VECTORIZE_EMBED_BATCH", "32"))
+
+    # Opt-in compact output: VECTORIZE_QUANTIZE=int8 returns int8 vectors
+    # plus a per-vector scale instead of float embeddings
+    QUANTIZE = os.getenv("VECTORIZE_QUANTIZE", "").strip().lower()
+
+    # Concurrent vectorize-query calls are embedded together in batches
+    QUERY_BATCH = int(os.getenv("VECTORIZE_QUERY_BATCH", "32"))
+    QUERY_WAIT_MS = float(os.getenv("VECTORIZE_QUERY_WAIT_MS", "20"))
+
     def __init__(self):
-        self.extraction_service = ExtractionService()
+        self.extraction_service = get_extraction_service()
+        self._embedding_service: Optional[EmbeddingService] = None
+        self._query_batcher = QueryBatcher(
+            self._embed_queries,
+            max_batch=self.QUERY_BATCH,
+            max_wait_ms=self.QUERY_WAIT_MS
+        )
+
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        # Resolved on first use so a missing API key only fails embedding
+        # calls, not service construction
+        if self._embedding_service is None:
+            self._embedding_service = get_embedding_service()
+        return self._embedding_service
 
     @staticmethod
+    def _embed(embedding_service: EmbeddingService, texts: List[str]) -> List[List[float]]:
+        """Embed texts, reusing cached embeddings for text seen before."""
+        return get_embedding_cache().get_or_compute_many(
+            texts,
+            model=embedding_service.config.MODEL,
+            dimensions=embedding_service.config.DIMENSIONS,
+            compute=embedding_service.embed_batch
+        )
+
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        return self._embed(self.embedding_service, queries)
+
+    async def _embed_concurrent(
+        self,
+        embedding_service: EmbeddingService,
+        texts: List[str]
+    ) -> List[List[float]]:
+        """
+        Embed texts as sub-batches of EMBED_BATCH, with up to EMBED_WORKERS
+        requests in flight, concatenating the results in input order.
+        """
+        batch_size = max(1, self.EMBED_BATCH)
+        sub_batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        results: List[Optional[List[List[float]]]] = [None] * len(sub_batches)
+        semaphore = asyncio.Semaphore(max(1, self.EMBED_WORKERS))
+
+        async def embed_sub_batch(position: int, sub_batch: List[str]) -> None:
+            async with semaphore:
+                results[position] = await to_thread.run_sync(
+                    self._embed, embedding_service, sub_batch
+                )
+
+        await asyncio.gather(*(
+            embed_sub_batch(position, sub_batch)
+            for position, sub_batch in enumerate(sub_batches)
+        ))
+
+        return [vector for sub_result in results for vector in sub_result]
+
+    @staticmethod
+    def _quantize_int8(vector: List[float]) -> Tuple[List[int], float]:
+        """
+        Symmetric int8 quantization; value ~= q * scale.
+        """
+        peak = max(map(abs, vector), default=0.0) or 1.0
+        factor = 127.0 / peak
+        return [round(value * factor) for value in vector], peak / 127.0
+
+    def _embedding_fields(self, vector: Optional[List[float]]) -> Dict[str, Any]:
+        """Embedding fields for a result doc, quantized if enabled."""
+        if self.QUANTIZE != "int8":
+            return {"embedding": vector}
+
+        if vector is None:
+            return {"embedding_int8": None, "embedding_scale": None}
+
+        quantized, scale = self._quantize_int8(vector)
+        return {"embedding_int8": quantized, "embedding_scale": scale}
+
+    @staticmethod
+    @lru_cache(maxsize=1)
     def _single_chunk_enabled() -> bool:
+        # Parsed once per process; a missing/invalid value raises and is
+        # not cached, so it keeps failing loudly until fixed
         value = os.getenv("VECTORIZE_SINGLE_CHUNK")
         if value is None:
             raise ValueError("VECTORIZE_SINGLE_CHUNK is not set in environment variables")
@@ -43,63 +223,96 @@ class VectorizeService:
         if overlap >= chunk_size:
             raise ValueError("chunk overlap must be smaller than chunk size")
 
-        chunks: List[str] = []
-        stride = chunk_size - overlap
-        start = 0
         text_len = len(normalized)
+        if text_len <= chunk_size:
+            return [normalized]
 
-        while start < text_len:
-            end = min(start + chunk_size, text_len)
-            chunk = normalized[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            if end >= text_len:
-                break
-            start += stride
+        stride = chunk_size - overlap
 
-        return chunks
+        # Windows start every `stride` chars; the last one is the first
+        # window that reaches the end of the text
+        last_window = max(0, -(-(text_len - chunk_size) // stride))
+        slices = (
+            normalized[start:start + chunk_size].strip()
+            for start in range(0, last_window * stride + 1, stride)
+        )
+        return [chunk for chunk in slices if chunk]
 
     @staticmethod
-    def _build_doc_id(filename: str, text: str, file_size: int = 0) -> str:
+    def _build_doc_id(
+        filename: str,
+        text: str,
+        file_size: int = 0,
+        file_hash: Optional[str] = None
+    ) -> str:
+        # Content hash of the uploaded bytes (computed once by extract_data),
+        # so renamed copies share a doc_id and same-size files don't collide.
+        # Both branches keep the 24-hex-char format, but the values differ
+        # from IDs issued by the old sha256(filename:len:size) scheme, so
+        # previously stored vectors need re-indexing to dedupe/upsert.
+        if file_hash:
+            return file_hash[:24]
+
         hash_source = f"{filename}:{len(text)}:{file_size}"
-        return sha256(hash_source.encode("utf-8")).hexdigest()[:24]
+        return blake2b(hash_source.encode("utf-8"), digest_size=12).hexdigest()
 
     @staticmethod
     def _build_text_from_formatted_data(formatted_data: Dict[str, Any]) -> str:
         if not isinstance(formatted_data, dict) or not formatted_data:
             return ""
 
-        lines: List[str] = []
+        buf = io.StringIO()
+        write = buf.write
+        has_lines = False
+
+        # Iterative depth-first walk; children are pushed in reverse so they
+        # pop in sorted-key / list order
+        stack: List[Tuple[str, Any]] = [("", formatted_data)]
+        while stack:
+            prefix, value = stack.pop()
 
-        def flatten(value: Any, prefix: str = "") -> None:
             if isinstance(value, dict):
-                for key in sorted(value.keys()):
-                    child = value.get(key)
+                for key in reversed(sorted(value)):
                     next_prefix = f"{prefix}.{key}" if prefix else str(key)
-                    flatten(child, next_prefix)
-                return
+                    stack.append((next_prefix, value[key]))
+                continue
 
             if isinstance(value, list):
-                for index, item in enumerate(value):
+                for index in range(len(value) - 1, -1, -1):
                     next_prefix = f"{prefix}[{index}]" if prefix else f"[{index}]"
-                    flatten(item, next_prefix)
-                return
+                    stack.append((next_prefix, value[index]))
+                continue
 
             value_text = "" if value is None else str(value).strip()
             if value_text and prefix:
-                lines.append(f"{prefix}: {value_text}")
-
-        flatten(formatted_data)
-
-        if not lines:
+                if has_lines:
+                    write("\n")
+                write(prefix)
+                write(": ")
+                write(value_text)
+                has_lines = True
+
+        if not has_lines:
             return ""
 
-        return "FORMATTED_DATA\n" + "\n".join(lines).strip()
+        return "FORMATTED_DATA\n" + buf.getvalue().strip()
 
-    async def vectorize_pdf(self, file: UploadFile) -> Dict[str, Any]:
+    @staticmethod
+    def _utc_now_iso() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+    async def vectorize_pdf(
+        self,
+        file: UploadFile,
+        created_at: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Vectorize a PDF by running it through the extract-data pipeline
         and then embedding the extracted formatted data.
+
+        The upload is streamed to disk by the extraction pipeline; the
+        blocking embedding calls and file cleanup run in worker threads.
+        created_at lets the caller stamp the chunks with its request time.
         """
         file_path = None
 
@@ -127,13 +340,14 @@ class VectorizeService:
             # Step 3: Vectorize the extracted text
             single_chunk_mode = self._single_chunk_enabled()
 
-            embedding_service = get_embedding_service()
+            embedding_service = self.embedding_service
             file_info = extraction_result.get("file_info", {})
-            created_at = datetime.now(timezone.utc).isoformat()
+            created_at = created_at or self._utc_now_iso()
             doc_id = self._build_doc_id(
                 filename=file_info.get("filename", ""),
                 text=full_text,
-                file_size=file_info.get("file_size", 0)
+                file_size=file_info.get("file_size", 0),
+                file_hash=extraction_result.get("file_hash")
             )
 
             base_metadata = {
@@ -144,8 +358,11 @@ class VectorizeService:
             }
 
             if single_chunk_mode:
-                single_embedding = embedding_service.embed_batch([full_text])[0]
-                has_embedding = any(value != 0.0 for value in single_embedding)
+                single_embedding = (await to_thread.run_sync(
+                    self._embed, embedding_service, [full_text]
+                ))[0]
+                # Float truthiness in C: only 0.0/-0.0 are falsy
+                has_embedding = any(single_embedding)
 
                 return {
                     "success": True,
@@ -155,7 +372,7 @@ class VectorizeService:
                     "single_chunk_mode": True,
                     "file_info": file_info,
                     "text": full_text,
-                    "embedding": single_embedding,
+                    **self._embedding_fields(single_embedding),
                     "created_at": created_at,
                     "has_embedding": has_embedding,
                     "metadata": base_metadata
@@ -173,27 +390,37 @@ class VectorizeService:
                     "error": "No chunks generated from PDF text"
                 }
 
-            embeddings = embedding_service.embed_batch(chunks)
+            # Embed each distinct chunk once (repeated boilerplate is common)
+            # and scatter the vectors back to every position it appears at
+            unique_index: Dict[str, int] = {}
+            for chunk_text in chunks:
+                unique_index.setdefault(chunk_text, len(unique_index))
 
-            chunk_docs: List[Dict[str, Any]] = []
-            embedded_chunks = 0
+            unique_embeddings = await self._embed_concurrent(
+                embedding_service, list(unique_index)
+            )
+            embeddings = [unique_embeddings[unique_index[chunk_text]] for chunk_text in chunks]
 
-            for index, chunk_text in enumerate(chunks):
-                vector = embeddings[index] if index < len(embeddings) else None
-                has_embedding = vector is not None and any(value != 0.0 for value in vector)
-                if has_embedding:
-                    embedded_chunks += 1
+            # One vector per chunk (the cache returns them in input order)
+            has_embeddings = [any(vector) for vector in embeddings]
+            embedded_chunks = sum(has_embeddings)
 
-                chunk_docs.append({
+            # base_metadata is shared by every chunk doc; treat it as read-only
+            chunk_docs: List[Dict[str, Any]] = [
+                {
                     "doc_id": doc_id,
                     "chunk_id": f"{doc_id}:{index}",
                     "chunk_index": index,
                     "text": chunk_text,
-                    "embedding": vector,
+                    **self._embedding_fields(vector),
                     "created_at": created_at,
                     "has_embedding": has_embedding,
                     "metadata": base_metadata
-                })
+                }
+                for index, (chunk_text, vector, has_embedding) in enumerate(
+                    zip(chunks, embeddings, has_embeddings)
+                )
+            ]
 
             return {
                 "success": True,
@@ -215,9 +442,13 @@ class VectorizeService:
             }
         finally:
             if file_path:
-                cleanup_file(file_path)
+                await to_thread.run_sync(cleanup_file, file_path)
 
-    def vectorize_query(self, query: str) -> Dict[str, Any]:
+    async def vectorize_query(
+        self,
+        query: str,
+        created_at: Optional[str] = None
+    ) -> Dict[str, Any]:
         clean_query = (query or "").strip()
         if not clean_query:
             return {
@@ -225,8 +456,8 @@ class VectorizeService:
                 "error": "Query text is required"
             }
 
-        embedding_service = get_embedding_service()
-        embedding = embedding_service.embed_batch([clean_query])[0]
+        embedding_service = self.embedding_service
+        embedding = await self._query_batcher.submit(clean_query)
 
         return {
             "success": True,
@@ -234,8 +465,8 @@ class VectorizeService:
             "embedding": embedding,
             "embedding_model": embedding_service.config.MODEL,
             "embedding_dimensions": embedding_service.config.DIMENSIONS,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "has_embedding": any(value != 0.0 for value in embedding)
+            "created_at": created_at or self._utc_now_iso(),
+            "has_embedding": any(embedding)
         }
 
 
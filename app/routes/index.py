@@ -24,7 +24,10 @@ main_router.include_router(vectorize_router)
 # ├── POST /api/extract-acord - Force ACORD pipeline
 # │   └── modules/extraction/routes.py → controller → service
 # │
-# └── POST /api/detect-acord - Detect if PDF is ACORD form
+# ├── POST /api/detect-acord - Detect if PDF is ACORD form
+# │   └── modules/extraction/routes.py → controller → service
+# │
+# └── POST /api/detect-acord/bulk - Detect ACORD forms for several PDFs
 #     └── modules/extraction/routes.py → controller → service
 #
 # VECTORIZER MODULE (/api)
@@ -27,13 +27,32 @@ ACORD_FIELD_PATTERNS = [
     "EachOccurrenceLimitAmount",
 ]
 
+# Lowercased once at import; matching is case-insensitive
+_ACORD_FIELD_PATTERNS_LOWER = tuple(
+    (pattern, pattern.lower()) for pattern in ACORD_FIELD_PATTERNS
+)
 
-def detect_acord_form(pdf_path: str | Path) -> Dict[str, Any]:
+# ACORD 25 - Certificate of Liability Insurance
+_ACORD_25_INDICATORS = (
+    "certificateholder",
+    "generalliability",
+    "automobileliability",
+    "workerscompensation",
+    "excessliability",
+    "namedinsured",
+)
+
+
+def detect_acord_form(
+    pdf_path: str | Path,
+    reader: Optional[PdfReader] = None
+) -> Dict[str, Any]:
     """
     Detect if a PDF is a fillable ACORD form.
     
     Args:
         pdf_path: Path to the PDF file
+        reader: Already-opened PdfReader for pdf_path (opened if omitted)
         
     Returns:
         Dictionary with detection results:
@@ -60,7 +79,8 @@ def detect_acord_form(pdf_path: str | Path) -> Dict[str, Any]:
         }
     
     try:
-        reader = PdfReader(str(pdf_path))
+        if reader is None:
+            reader = PdfReader(str(pdf_path))
         fields = reader.get_fields()
         
         if fields is None or len(fields) == 0:
@@ -74,28 +94,27 @@ def detect_acord_form(pdf_path: str | Path) -> Dict[str, Any]:
             }
         
         field_count = len(fields)
-        field_names = list(fields.keys())
         
-        # Check how many ACORD patterns match
-        pattern_matches = 0
-        matched_patterns = []
+        # All field names, lowercased once and newline-joined, so each
+        # pattern is a single substring search (names never contain "\n")
+        haystack = "\n".join(fields).lower()
         
-        for pattern in ACORD_FIELD_PATTERNS:
-            for field_name in field_names:
-                if pattern.lower() in field_name.lower():
-                    pattern_matches += 1
-                    matched_patterns.append(pattern)
-                    break  # Count each pattern only once
+        # Check how many ACORD patterns match (each pattern counted once)
+        matched_patterns = [
+            pattern for pattern, pattern_lower in _ACORD_FIELD_PATTERNS_LOWER
+            if pattern_lower in haystack
+        ]
+        pattern_matches = len(matched_patterns)
         
         # Determine if this is an ACORD form and confidence level
         is_acord = pattern_matches >= 3
         
         if pattern_matches >= 8:
             confidence = "high"
-            detected_form_type = _detect_acord_form_type(field_names)
+            detected_form_type = _detect_acord_form_type(haystack)
         elif pattern_matches >= 5:
             confidence = "medium"
-            detected_form_type = _detect_acord_form_type(field_names)
+            detected_form_type = _detect_acord_form_type(haystack)
         elif pattern_matches >= 3:
             confidence = "low"
             detected_form_type = "Possible ACORD form"
@@ -125,30 +144,18 @@ def detect_acord_form(pdf_path: str | Path) -> Dict[str, Any]:
         }
 
 
-def _detect_acord_form_type(field_names: list) -> str:
+def _detect_acord_form_type(haystack: str) -> str:
     """
     Attempt to identify which ACORD form this is.
     
     Args:
-        field_names: List of all field names in the PDF
+        haystack: Lowercased field names of the PDF, joined by newlines
         
     Returns:
         Detected form type string
     """
-    field_names_lower = [f.lower() for f in field_names]
-    
-    # ACORD 25 - Certificate of Liability Insurance
-    acord_25_indicators = [
-        "certificateholder",
-        "generalliability",
-        "automobileliability",
-        "workerscompensation",
-        "excessliability",
-        "namedinsured"
-    ]
-    
-    acord_25_matches = sum(1 for indicator in acord_25_indicators 
-                          if any(indicator in fn for fn in field_names_lower))
+    acord_25_matches = sum(1 for indicator in _ACORD_25_INDICATORS
+                          if indicator in haystack)
     
     if acord_25_matches >= 4:
         return "ACORD 25 - Certificate of Liability Insurance"
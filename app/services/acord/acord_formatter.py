@@ -6,8 +6,27 @@ Coverage sections use predefined structure.
 Unformatted data uses AI-structured data directly.
 """
 
+from functools import lru_cache
 from typing import Dict, Any
 
+# Checkbox values that mean "checked"
+_TRUE_TOKENS = frozenset(('yes', 'y', 'true', '1', '/1', '/yes', 'x', 'checked'))
+
+# Boolean-like strings that don't belong in limit fields
+_BOOL_STR_TOKENS = frozenset(('yes', 'no', 'true', 'false', 'y', 'n'))
+
+
+# Checkbox/limit values repeat heavily across forms ("/1", "Yes", "$1,000,000"),
+# so the string paths are memoized; the cache is bounded for odd inputs
+@lru_cache(maxsize=512)
+def _checkbox_from_str(value: str) -> str:
+    return "Yes" if value.lower().strip() in _TRUE_TOKENS else "No"
+
+
+@lru_cache(maxsize=512)
+def _limit_from_str(value: str) -> str:
+    return "" if value.lower().strip() in _BOOL_STR_TOKENS else value
+
 
 def format_checkbox(value: Any) -> str:
     """Convert checkbox/indicator value to 'Yes' or 'No' string."""
@@ -16,9 +35,7 @@ def format_checkbox(value: Any) -> str:
     if isinstance(value, bool):
         return "Yes" if value else "No"
     if isinstance(value, str):
-        val_lower = value.lower().strip()
-        if val_lower in ['yes', 'y', 'true', '1', '/1', '/yes', 'x', 'checked']:
-            return "Yes"
+        return _checkbox_from_str(value)
     return "No"
 
 
@@ -29,13 +46,141 @@ def format_limit(value: Any) -> str:
     
     # Handle boolean-like strings that shouldn't be in limit fields
     if isinstance(value, str):
-        val_lower = value.lower().strip()
-        if val_lower in ['yes', 'no', 'true', 'false', 'y', 'n']:
-            return ""
+        return _limit_from_str(value)
             
     return str(value)
 
 
+# Field schemas for the coverage tabs: (output key, source key, formatter).
+# A formatter of None passes the source value through unchanged.
+_CB = format_checkbox
+_LIM = format_limit
+
+_POLICY_DATES = (
+    ("insurer_letter", "insurer_letter", None),
+    ("policy_number", "policy_number", None),
+    ("effective_date", "effective_date", None),
+    ("expiration_date", "expiration_date", None),
+)
+
+_POLICY_FLAGS = (
+    ("additional_insured", "additional_insured", _CB),
+    ("subrogation_waived", "subrogation_waived", _CB),
+)
+
+_POLICY_INFORMATION = _POLICY_DATES + _POLICY_FLAGS
+
+_CUSTOM_OPTIONS = (
+    ("custom_option_1", "custom_option_1", _CB),
+    ("custom_option_1_value", "custom_option_1_value", None),
+    ("custom_option_2", "custom_option_2", _CB),
+    ("custom_option_2_value", "custom_option_2_value", None),
+)
+
+_GL_OPTIONS = (
+    ("general_liability_coverage_indicator", "general_liability_coverage_indicator", _CB),
+    ("claims_made", "claims_made", _CB),
+    ("occurrence", "occurrence", _CB),
+) + _CUSTOM_OPTIONS + (
+    ("aggregate_applies_policy", "general_aggregate_limit_applies_per_policy", _CB),
+    ("aggregate_applies_project", "general_aggregate_limit_applies_per_project", _CB),
+    ("aggregate_applies_location", "general_aggregate_limit_applies_per_location", _CB),
+    ("aggregate_applies_other", "general_aggregate_limit_applies_per_other", _CB),
+    ("aggregate_applies_other_value", "general_aggregate_limit_applies_per_other_value", None),
+)
+
+_GL_LIMITS = (
+    ("each_occurrence", "each_occurrence", _LIM),
+    ("damage_to_rented_premises", "damage_to_rented_premises", _LIM),
+    ("med_exp", "medical_expense", _LIM),
+    ("personal_adv_injury", "personal_adv_injury", _LIM),
+    ("general_aggregate", "general_aggregate", _LIM),
+    ("products_comp_op_agg", "products_comp_op_agg", _LIM),
+)
+
+_AUTO_OPTIONS = (
+    ("any_auto", "any_auto", _CB),
+    ("owned_autos_only", "owned_autos_only", _CB),
+    ("hired_autos_only", "hired_autos_only", _CB),
+    ("scheduled_autos_only", "scheduled_autos_only", _CB),
+    ("non_owned_autos_only", "non_owned_autos_only", _CB),
+) + _CUSTOM_OPTIONS
+
+_AUTO_LIMITS = (
+    ("combined_single_limit", "combined_single_limit", _LIM),
+    ("bodily_injury_person", "bodily_injury_per_person", _LIM),
+    ("bodily_injury_accident", "bodily_injury_per_accident", _LIM),
+    ("property_damage", "property_damage", _LIM),
+)
+
+_UMBRELLA_OPTIONS = (
+    ("umbrella_liability", "umbrella_liab", _CB),
+    ("excess_liability", "excess_liab", _CB),
+    ("occurrence", "occurrence", _CB),
+    ("claims_made", "claims_made", _CB),
+    ("deductible", "deductible", _CB),
+    ("retention_checkbox", "retention", _CB),
+    ("retention", "retention_amount", _LIM),
+)
+
+_UMBRELLA_LIMITS = (
+    ("each_occurrence", "each_occurrence", _LIM),
+    ("aggregate", "aggregate", _LIM),
+)
+
+_WC_INFORMATION = _POLICY_DATES + (
+    ("any_officers_excluded", "any_excluded", _CB),
+) + _POLICY_FLAGS
+
+_WC_OPTIONS = (
+    ("per_statute", "per_statute", _CB),
+    ("other", "other", _CB),
+)
+
+_WC_LIMITS = (
+    ("per_statute_other_limit", "per_statute_other_limit", _LIM),
+    ("each_accident", "each_accident", _LIM),
+    ("each_employee", "disease_each_employee", _LIM),
+    ("disease_policy_limit", "disease_policy_limit", _LIM),
+)
+
+# (output tab, organized_data key, policy_information, policy_options, policy_limits)
+_COVERAGE_TABS = (
+    ("general_liability", "general_liability", _POLICY_INFORMATION, _GL_OPTIONS, _GL_LIMITS),
+    ("automobile_liability", "auto_liability", _POLICY_INFORMATION, _AUTO_OPTIONS, _AUTO_LIMITS),
+    ("umbrella_liability", "umbrella", _POLICY_INFORMATION, _UMBRELLA_OPTIONS, _UMBRELLA_LIMITS),
+    ("workers_comp", "workers_comp", _WC_INFORMATION, _WC_OPTIONS, _WC_LIMITS),
+)
+
+_OTHER_LIMIT_ORDINALS = ("first", "second", "third")
+
+
+def _build_section(source: Dict[str, Any], fields) -> Dict[str, Any]:
+    """Build one tab section from a field schema."""
+    get = source.get
+    return {
+        out_key: fmt(get(src_key)) if fmt is not None else get(src_key)
+        for out_key, src_key, fmt in fields
+    }
+
+
+def _build_coverage_tab(section: Dict[str, Any], info_fields, option_fields, limit_fields) -> Dict[str, Any]:
+    """Build the information/options/limits layout of one coverage tab."""
+    return {
+        "policy_information": _build_section(section, info_fields),
+        "policy_options": _build_section(section, option_fields),
+        "policy_limits": _build_section(section, limit_fields)
+    }
+
+
+# Tabs for coverages missing from the form, built once; copied per call
+# because callers may mutate the formatted output
+_EMPTY_COVERAGE_TABS = {
+    tab_key: _build_coverage_tab({}, info_fields, option_fields, limit_fields)
+    for tab_key, _, info_fields, option_fields, limit_fields in _COVERAGE_TABS
+}
+
+
 def format_for_tabs(organized_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Transform organized ACORD data into tabbed UI format.
@@ -46,150 +191,54 @@ def format_for_tabs(organized_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Data formatted for tabbed UI display
     """
-    # Extract source data with defaults
-    gl = organized_data.get("general_liability", {}) or {}
-    auto = organized_data.get("auto_liability", {}) or {}
-    umbrella = organized_data.get("umbrella", {}) or {}
-    wc = organized_data.get("workers_comp", {}) or {}
-    other = organized_data.get("other", {}) or {}
-    
-    # AI-structured unformatted data (flexible structure)
-    unformatted = organized_data.get("unformatted_data", {}) or {}
+    get = organized_data.get
     
     # Build tabbed output structure
     tabbed_output = {
         "information": {
-            "certificate_date": organized_data.get("issue_date"),
-            "certificate_number": organized_data.get("certificate_number"),
-            "description_of_operations": organized_data.get("remarks"),
-            "certificate_holder": organized_data.get("certificate_holder"),
-            "authorized_representative": organized_data.get("authorized_representative")
-        },
-        "general_liability": {
-            "policy_information": {
-                "insurer_letter": gl.get("insurer_letter"),
-                "policy_number": gl.get("policy_number"),
-                "effective_date": gl.get("effective_date"),
-                "expiration_date": gl.get("expiration_date"),
-                "additional_insured": format_checkbox(gl.get("additional_insured")),
-                "subrogation_waived": format_checkbox(gl.get("subrogation_waived"))
-            },
-            "policy_options": {
-                "general_liability_coverage_indicator": format_checkbox(gl.get("general_liability_coverage_indicator")),
-                "claims_made": format_checkbox(gl.get("claims_made")),
-                "occurrence": format_checkbox(gl.get("occurrence")),
-                "custom_option_1": format_checkbox(gl.get("custom_option_1")),
-                "custom_option_1_value": gl.get("custom_option_1_value"),
-                "custom_option_2": format_checkbox(gl.get("custom_option_2")),
-                "custom_option_2_value": gl.get("custom_option_2_value"),
-                "aggregate_applies_policy": format_checkbox(gl.get("general_aggregate_limit_applies_per_policy")),
-                "aggregate_applies_project": format_checkbox(gl.get("general_aggregate_limit_applies_per_project")),
-                "aggregate_applies_location": format_checkbox(gl.get("general_aggregate_limit_applies_per_location")),
-                "aggregate_applies_other": format_checkbox(gl.get("general_aggregate_limit_applies_per_other")),
-                "aggregate_applies_other_value": gl.get("general_aggregate_limit_applies_per_other_value")
-            },
-            "policy_limits": {
-                "each_occurrence": format_limit(gl.get("each_occurrence")),
-                "damage_to_rented_premises": format_limit(gl.get("damage_to_rented_premises")),
-                "med_exp": format_limit(gl.get("medical_expense")),
-                "personal_adv_injury": format_limit(gl.get("personal_adv_injury")),
-                "general_aggregate": format_limit(gl.get("general_aggregate")),
-                "products_comp_op_agg": format_limit(gl.get("products_comp_op_agg"))
-            }
-        },
-        "automobile_liability": {
-            "policy_information": {
-                "insurer_letter": auto.get("insurer_letter"),
-                "policy_number": auto.get("policy_number"),
-                "effective_date": auto.get("effective_date"),
-                "expiration_date": auto.get("expiration_date"),
-                "additional_insured": format_checkbox(auto.get("additional_insured")),
-                "subrogation_waived": format_checkbox(auto.get("subrogation_waived"))
-            },
-            "policy_options": {
-                "any_auto": format_checkbox(auto.get("any_auto")),
-                "owned_autos_only": format_checkbox(auto.get("owned_autos_only")),
-                "hired_autos_only": format_checkbox(auto.get("hired_autos_only")),
-                "scheduled_autos_only": format_checkbox(auto.get("scheduled_autos_only")),
-                "non_owned_autos_only": format_checkbox(auto.get("non_owned_autos_only")),
-                "custom_option_1": format_checkbox(auto.get("custom_option_1")),
-                "custom_option_1_value": auto.get("custom_option_1_value"),
-                "custom_option_2": format_checkbox(auto.get("custom_option_2")),
-                "custom_option_2_value": auto.get("custom_option_2_value")
-            },
-            "policy_limits": {
-                "combined_single_limit": format_limit(auto.get("combined_single_limit")),
-                "bodily_injury_person": format_limit(auto.get("bodily_injury_per_person")),
-                "bodily_injury_accident": format_limit(auto.get("bodily_injury_per_accident")),
-                "property_damage": format_limit(auto.get("property_damage"))
-            }
-        },
-        "umbrella_liability": {
-            "policy_information": {
-                "insurer_letter": umbrella.get("insurer_letter"),
-                "policy_number": umbrella.get("policy_number"),
-                "effective_date": umbrella.get("effective_date"),
-                "expiration_date": umbrella.get("expiration_date"),
-                "additional_insured": format_checkbox(umbrella.get("additional_insured")),
-                "subrogation_waived": format_checkbox(umbrella.get("subrogation_waived"))
-            },
-            "policy_options": {
-                "umbrella_liability": format_checkbox(umbrella.get("umbrella_liab")),
-                "excess_liability": format_checkbox(umbrella.get("excess_liab")),
-                "occurrence": format_checkbox(umbrella.get("occurrence")),
-                "claims_made": format_checkbox(umbrella.get("claims_made")),
-                "deductible": format_checkbox(umbrella.get("deductible")),
-                "retention_checkbox": format_checkbox(umbrella.get("retention")),
-                "retention": format_limit(umbrella.get("retention_amount"))
-            },
-            "policy_limits": {
-                "each_occurrence": format_limit(umbrella.get("each_occurrence")),
-                "aggregate": format_limit(umbrella.get("aggregate"))
+            "certificate_date": get("issue_date"),
+            "certificate_number": get("certificate_number"),
+            "description_of_operations": get("remarks"),
+            "certificate_holder": get("certificate_holder"),
+            "authorized_representative": get("authorized_representative")
+        }
+    }
+    
+    # Coverage sections with a fixed information/options/limits layout
+    for tab_key, source_key, info_fields, option_fields, limit_fields in _COVERAGE_TABS:
+        section = get(source_key)
+        if not section:
+            # Section values are flat strings/None, so a shallow copy per group suffices
+            tabbed_output[tab_key] = {
+                group: dict(fields) for group, fields in _EMPTY_COVERAGE_TABS[tab_key].items()
             }
+            continue
+        tabbed_output[tab_key] = _build_coverage_tab(section, info_fields, option_fields, limit_fields)
+    
+    other = get("other", {}) or {}
+    tabbed_output["other_coverage"] = {
+        "policy_information": {
+            "insurer_letter": other.get("insurer_letter"),
+            "type_of_insurance": other.get("type_of_insurance") or "Other",
+            "policy_number": other.get("policy_number"),
+            "effective_date": other.get("effective_date"),
+            "expiration_date": other.get("expiration_date"),
+            "additional_insured": format_checkbox(other.get("addl")),
+            "subrogation_waived": format_checkbox(other.get("subr"))
         },
-        "workers_comp": {
-            "policy_information": {
-                "insurer_letter": wc.get("insurer_letter"),
-                "policy_number": wc.get("policy_number"),
-                "effective_date": wc.get("effective_date"),
-                "expiration_date": wc.get("expiration_date"),
-                "any_officers_excluded": format_checkbox(wc.get("any_excluded")),
-                "additional_insured": format_checkbox(wc.get("additional_insured")),
-                "subrogation_waived": format_checkbox(wc.get("subrogation_waived"))
-            },
-            "policy_options": {
-                "per_statute": format_checkbox(wc.get("per_statute")),
-                "other": format_checkbox(wc.get("other"))
-            },
-            "policy_limits": {
-                "per_statute_other_limit": format_limit(wc.get("per_statute_other_limit")),
-                "each_accident": format_limit(wc.get("each_accident")),
-                "each_employee": format_limit(wc.get("disease_each_employee")),
-                "disease_policy_limit": format_limit(wc.get("disease_policy_limit"))
+        "policy_limits": [
+            {
+                "policy_option": other.get(f"{ordinal}_policy_option"),
+                "policy_limit": format_limit(other.get(f"{ordinal}_policy_limit"))
             }
-        },
-        "other_coverage": {
-            "policy_information": {
-                "insurer_letter": other.get("insurer_letter"),
-                "type_of_insurance": other.get("type_of_insurance") if other.get("type_of_insurance") else "Other",
-                "policy_number": other.get("policy_number"),
-                "effective_date": other.get("effective_date"),
-                "expiration_date": other.get("expiration_date"),
-                "additional_insured": format_checkbox(other.get("addl")),
-                "subrogation_waived": format_checkbox(other.get("subr"))
-            },
-            "policy_limits": [
-                {"policy_option": other.get("first_policy_option"), "policy_limit": format_limit(other.get("first_policy_limit"))},
-                {"policy_option": other.get("second_policy_option"), "policy_limit": format_limit(other.get("second_policy_limit"))},
-                {"policy_option": other.get("third_policy_option"), "policy_limit": format_limit(other.get("third_policy_limit"))}
-            ]
-        },
-        
-        # AI-structured unformatted data - include directly as returned by AI
-        # This section adapts to available data (no predefined null fields)
-        "unformatted_data": unformatted
+            for ordinal in _OTHER_LIMIT_ORDINALS
+        ]
     }
     
+    # AI-structured unformatted data - include directly as returned by AI
+    # This section adapts to available data (no predefined null fields)
+    tabbed_output["unformatted_data"] = get("unformatted_data", {}) or {}
+    
     return tabbed_output
 
 
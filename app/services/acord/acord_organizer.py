@@ -7,11 +7,42 @@ Uses OpenAI GPT to organize ONLY unformatted/supplementary data
 Coverage sections are handled by direct_mapper.py without AI.
 """
 
+import asyncio
 import json
-from typing import Dict, Any
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Dict, Any, List
 
+from anyio import to_thread
+
+from app.config.config import Config
 from app.services.ai.openai_service import get_openai_service
 
+# Fenced code block (```json ... ``` or ``` ... ```) around the AI's JSON
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
+_JSON_DECODER = json.JSONDecoder()
+
+_SYSTEM_MSG = {
+    "role": "system",
+    "content": "You are an expert at organizing insurance form contact and entity data. Return ONLY valid JSON."
+}
+
+# Filled with str.format(raw_data=...); literal braces are doubled
+_PROMPT_TEMPLATE = """Organize ACORD insurance data into JSON:
+
+INPUT: {raw_data}
+
+OUTPUT FORMAT:
+{{"insured":{{"name":"...","address":"..."}},"producer":{{"name":"...","address":"...","contact_person":"...","phone":"...","fax":"...","email":"..."}},"certificate_holder":{{"name":"...","address":"..."}},"insurers":[{{"letter":"A","name":"...","naic":"..."}}],"additional_fields":{{"Human Readable Label":"value"}}}}
+
+RULES:
+1. Combine multi-line addresses into one string
+2. Only include fields with data
+3. Convert field names to Title Case labels in additional_fields (e.g. "OtherPolicy_Code_A" → "Other Policy Code A")
+4. Return ONLY valid JSON"""
+
 
 class AcordOrganizer:
     """
@@ -47,10 +78,7 @@ class AcordOrganizer:
             # Call OpenAI API
             response = self.openai_service.chat_completion(
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at organizing insurance form contact and entity data. Return ONLY valid JSON."
-                    },
+                    _SYSTEM_MSG,
                     {
                         "role": "user",
                         "content": prompt
@@ -84,25 +112,76 @@ class AcordOrganizer:
                 "unformatted_data": {}
             }
     
+    async def organize_unformatted_async(self, unmapped_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of organize_unformatted.
+        
+        The blocking OpenAI call runs in a worker thread so the event loop
+        stays free while the request is in flight.
+        
+        Args:
+            unmapped_fields: Dictionary of PDF fields not consumed by direct mapper
+            
+        Returns:
+            AI-structured data for unformatted sections
+        """
+        return await to_thread.run_sync(self.organize_unformatted, unmapped_fields)
+    
+    async def organize_many_async(self, unmapped_fields_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Organize several forms' unformatted fields concurrently.
+        
+        Up to Config.ORGANIZE_CONCURRENCY OpenAI calls are in flight at once,
+        so a batch costs roughly one round trip per wave instead of one per form.
+        
+        Args:
+            unmapped_fields_list: Unmapped fields of each form
+            
+        Returns:
+            organize_unformatted results, in the same order as the input
+        """
+        sem = asyncio.Semaphore(Config.ORGANIZE_CONCURRENCY)
+        
+        async def organize_one(unmapped_fields: Dict[str, Any]) -> Dict[str, Any]:
+            async with sem:
+                return await self.organize_unformatted_async(unmapped_fields)
+        
+        return await asyncio.gather(*(organize_one(fields) for fields in unmapped_fields_list))
+    
+    def organize_many(self, unmapped_fields_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Synchronous variant of organize_many_async for non-async callers.
+        
+        Uses a short-lived thread pool of Config.ORGANIZE_CONCURRENCY
+        workers, so it is safe to call whether or not an event loop is
+        running in the calling thread.
+        
+        Args:
+            unmapped_fields_list: Unmapped fields of each form
+            
+        Returns:
+            organize_unformatted results, in the same order as the input
+        """
+        if not unmapped_fields_list:
+            return []
+        
+        workers = max(1, min(Config.ORGANIZE_CONCURRENCY, len(unmapped_fields_list)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="organize") as executor:
+            return list(executor.map(self.organize_unformatted, unmapped_fields_list))
+    
     def _build_guidance_prompt(self, unmapped_fields: Dict[str, Any]) -> str:
         """Build a concise prompt for fast AI processing."""
-        # Build compact raw data
-        items = [f'"{k}": "{str(v).strip()}"' for k, v in unmapped_fields.items() 
-                 if v is not None and str(v).strip()]
-        raw_data = "{" + ", ".join(items) + "}"
+        # Build compact raw data; json.dumps escapes quotes/newlines in values
+        fields = {}
+        for k, v in unmapped_fields.items():
+            if v is None:
+                continue
+            text = str(v).strip()
+            if text:
+                fields[k] = text
+        raw_data = json.dumps(fields, ensure_ascii=False)
         
-        return f"""Organize ACORD insurance data into JSON:
-
-INPUT: {raw_data}
-
-OUTPUT FORMAT:
-{{"insured":{{"name":"...","address":"..."}},"producer":{{"name":"...","address":"...","contact_person":"...","phone":"...","fax":"...","email":"..."}},"certificate_holder":{{"name":"...","address":"..."}},"insurers":[{{"letter":"A","name":"...","naic":"..."}}],"additional_fields":{{"Human Readable Label":"value"}}}}
-
-RULES:
-1. Combine multi-line addresses into one string
-2. Only include fields with data
-3. Convert field names to Title Case labels in additional_fields (e.g. "OtherPolicy_Code_A" → "Other Policy Code A")
-4. Return ONLY valid JSON"""
+        return _PROMPT_TEMPLATE.format(raw_data=raw_data)
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """
@@ -119,41 +198,32 @@ RULES:
         
         response = response.strip()
         
-        # If response starts with ```json, extract the JSON block
-        if "```json" in response:
-            start = response.find("```json") + 7
-            end = response.find("```", start)
-            if end > start:
-                response = response[start:end].strip()
-        elif "```" in response:
-            start = response.find("```") + 3
-            end = response.find("```", start)
-            if end > start:
-                response = response[start:end].strip()
-        
-        # Try to parse as JSON
+        # json_object mode normally returns bare JSON
         try:
             return json.loads(response)
         except json.JSONDecodeError:
-            # Try to find JSON object in the response
-            start = response.find("{")
-            end = response.rfind("}") + 1
-            if start >= 0 and end > start:
-                try:
-                    return json.loads(response[start:end])
-                except json.JSONDecodeError:
-                    pass
+            pass
+        
+        # Fenced block
+        match = _FENCE_RE.search(response)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except json.JSONDecodeError:
+                pass
+        
+        # First JSON object in the text, ignoring anything after it
+        start = response.find("{")
+        if start >= 0:
+            try:
+                return _JSON_DECODER.raw_decode(response, start)[0]
+            except json.JSONDecodeError:
+                pass
         
         return {}
 
 
-# Singleton instance
-_acord_organizer = None
-
-
+@cache
 def get_acord_organizer() -> AcordOrganizer:
     """Get or create ACORD organizer singleton."""
-    global _acord_organizer
-    if _acord_organizer is None:
-        _acord_organizer = AcordOrganizer()
-    return _acord_organizer
+    return AcordOrganizer()
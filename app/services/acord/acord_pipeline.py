@@ -7,7 +7,9 @@ Hybrid extraction approach:
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from pypdf import PdfReader
 
 from app.services.acord.acord_detector import detect_acord_form
 from app.services.pypdf_extractor import extract_form_fields_for_structuring as extract_pdf_fields
@@ -32,12 +34,19 @@ class AcordExtractionPipeline:
         self.organizer = get_acord_organizer()
         self.formatter = AcordFormatter()
     
-    def process(self, pdf_path: str | Path) -> Dict[str, Any]:
+    def process(
+        self,
+        pdf_path: str | Path,
+        reader: Optional[PdfReader] = None,
+        detection: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Process a PDF through the hybrid ACORD extraction pipeline.
         
         Args:
             pdf_path: Path to the PDF file
+            reader: Already-opened PdfReader for pdf_path, to avoid re-parsing
+            detection: Result of detect_acord_form() if the caller already ran it
             
         Returns:
             Complete processing result with formatted_data
@@ -51,15 +60,16 @@ class AcordExtractionPipeline:
             "error": None
         }
         
-        # Step 1: Detect if ACORD form
-        detection = detect_acord_form(pdf_path)
+        # Step 1: Detect if ACORD form (skipped if the caller already did)
+        if detection is None:
+            detection = detect_acord_form(pdf_path, reader=reader)
         
         if not detection.get("is_fillable"):
             result["error"] = "PDF is not a fillable form. Use universal extraction instead."
             return result
         
         # Step 2: Extract form fields using PyPDF
-        extraction_result = extract_pdf_fields(pdf_path)
+        extraction_result = extract_pdf_fields(pdf_path, reader=reader)
         
         if not extraction_result.get("success"):
             result["error"] = extraction_result.get("error", "Failed to extract form fields")
@@ -96,6 +106,8 @@ class AcordExtractionPipeline:
         result["success"] = True
         result["formatted_data"] = formatted_data
         result["tokens_used"] = ai_result.get("tokens_used", {})
+        # False when the AI step failed and unformatted data is missing
+        result["ai_complete"] = bool(ai_result.get("success"))
         
         return result
     
@@ -1,7 +1,8 @@
 """
 AI Services for ACORD Data Extraction
 """
-from .openai_service import OpenAIService, get_openai_service
+from .openai_service import OpenAIService, get_openai_service, get_http_client, close_http_client
 from .embedding_service import EmbeddingService, get_embedding_service
+from .embedding_cache import EmbeddingCache, get_embedding_cache
 
-__all__ = ['OpenAIService', 'get_openai_service', 'EmbeddingService', 'get_embedding_service']
+__all__ = ['OpenAIService', 'get_openai_service', 'get_http_client', 'close_http_client', 'EmbeddingService', 'get_embedding_service', 'EmbeddingCache', 'get_embedding_cache']
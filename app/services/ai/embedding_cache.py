@@ -0,0 +1,240 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are stored in a local SQLite database (WAL mode) keyed on a
+digest of (model, dimensions, text), so repeated chunks and queries skip
+the embedding API round-trip. Rows older than max_age are ignored, and the
+table is pruned to max_rows (oldest first) every few writes.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+# Expired/excess rows are pruned every this many write batches
+_PRUNE_INTERVAL = 32
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache shared by all workers on the host."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_rows: int = 20000,
+        max_age: float = 30 * 24 * 3600,
+        enabled: bool = True
+    ):
+        self.db_path = Path(db_path)
+        # When disabled, every call goes straight to compute and the
+        # database is never opened
+        self.enabled = enabled
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.db_path),
+                check_same_thread=False,
+                isolation_level=None,
+                timeout=5.0
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key BLOB PRIMARY KEY, vector BLOB NOT NULL, "
+                "created_at REAL NOT NULL DEFAULT 0)"
+            )
+            # Databases created before created_at existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            if "created_at" not in columns:
+                conn.execute(
+                    "ALTER TABLE embeddings ADD COLUMN created_at REAL NOT NULL DEFAULT 0"
+                )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key(text: str, model: str, dimensions: int) -> bytes:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{model}\0{dimensions}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    @staticmethod
+    def _pack(vector: List[float]) -> bytes:
+        # float64 so cached vectors are returned exactly as the API sent them
+        return array("d", vector).tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> List[float]:
+        vector = array("d")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def _get_many(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        found: Dict[bytes, List[float]] = {}
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings "
+                    f"WHERE key IN ({placeholders}) AND created_at >= ?",
+                    [*batch, cutoff]
+                )
+                for key, blob in rows:
+                    found[key] = self._unpack(blob)
+        return found
+
+    def _put_many(self, items: Dict[bytes, List[float]]) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                    [(key, self._pack(vector), now) for key, vector in items.items()]
+                )
+
+            self._writes += 1
+            if self._writes % _PRUNE_INTERVAL == 1:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> int:
+        """Delete expired rows, then the oldest beyond max_rows. Caller holds the lock."""
+        with conn:
+            conn.execute("BEGIN")
+            removed = conn.execute(
+                "DELETE FROM embeddings WHERE created_at < ?",
+                (time.time() - self.max_age,)
+            ).rowcount
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+            excess = count - self.max_rows
+            if excess > 0:
+                removed += conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                    (excess,)
+                ).rowcount
+        return removed
+
+    def prune(self) -> int:
+        """
+        Delete expired rows and the oldest rows beyond max_rows.
+
+        Returns:
+            Number of rows removed
+        """
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._prune(self._connect())
+
+    def get_or_compute_many(
+        self,
+        texts: List[str],
+        model: str,
+        dimensions: int,
+        compute: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """
+        Return embeddings for texts, computing only the ones not cached.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model name (part of the cache key)
+            dimensions: Embedding dimensions (part of the cache key)
+            compute: Batch embedding function, called once with the misses
+
+        Returns:
+            One embedding per text, in order
+
+        Raises:
+            ValueError: If compute returns a different number of vectors
+        """
+        if not texts:
+            return []
+
+        keys = [self._key(text, model, dimensions) for text in texts]
+
+        found: Dict[bytes, List[float]] = {}
+        if self.enabled:
+            try:
+                found = self._get_many(list(set(keys)))
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+
+        missing = [index for index, key in enumerate(keys) if key not in found]
+        if missing:
+            computed = compute([texts[index] for index in missing])
+            if len(computed) != len(missing):
+                raise ValueError(
+                    f"Embedding returned {len(computed)} vectors for {len(missing)} texts"
+                )
+
+            new_items: Dict[bytes, List[float]] = {}
+            for index, vector in zip(missing, computed):
+                found[keys[index]] = vector
+                # All-zero vectors are embed_batch's failure placeholder
+                if any(vector):
+                    new_items[keys[index]] = vector
+
+            try:
+                if self.enabled:
+                    self._put_many(new_items)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+        return [found[key] for key in keys]
+
+    def get_or_compute(
+        self,
+        text: str,
+        model: str,
+        dimensions: int,
+        compute: Callable[[List[str]], List[List[float]]]
+    ) -> List[float]:
+        """Single-text form of get_or_compute_many."""
+        return self.get_or_compute_many([text], model, dimensions, compute)[0]
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            Config.CACHE_FOLDER / "embeddings.sqlite3",
+            max_rows=Config.EMBEDDING_CACHE_MAX_ROWS,
+            max_age=Config.EMBEDDING_CACHE_MAX_AGE,
+            enabled=Config.EMBEDDING_CACHE_ENABLED
+        )
+    return _embedding_cache
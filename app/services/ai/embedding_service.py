@@ -9,6 +9,8 @@ from typing import List, Optional
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from app.services.ai.openai_service import get_http_client
+
 load_dotenv(override=True)
 
 
@@ -33,7 +35,8 @@ class EmbeddingService:
         self.client = OpenAI(
             api_key=self.api_key,
             timeout=self.config.TIMEOUT_SECONDS,
-            max_retries=self.config.MAX_RETRIES
+            max_retries=self.config.MAX_RETRIES,
+            http_client=get_http_client()
         )
 
     def _normalize_embedding(self, embedding: List[float]) -> List[float]:
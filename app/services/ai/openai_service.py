@@ -3,10 +3,36 @@ OpenAI API Service for GPT-4-turbo
 """
 import json
 from typing import Optional, Dict, Any
+
+import httpx
 from openai import OpenAI
 from app.config.config import Config
 
 
+# Shared HTTP client so every OpenAI SDK client reuses one connection pool
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client used by OpenAI SDK clients"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+            # No pool timeout: bursts wait for a free connection instead of failing
+            timeout=httpx.Timeout(600.0, connect=10.0, pool=None)
+        )
+    return _http_client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
 class OpenAIService:
     """Service for interacting with OpenAI API (GPT-4-turbo)"""
     
@@ -25,7 +51,7 @@ class OpenAIService:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is not configured")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=get_http_client())
     
     def chat_completion(
         self,
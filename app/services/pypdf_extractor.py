@@ -14,12 +14,32 @@ from pypdf import PdfReader
 logging.getLogger("pypdf").setLevel(logging.ERROR)
 
 
-def extract_form_fields(pdf_path: str | Path) -> Dict[str, Any]:
+def open_pdf_reader(pdf_path: str | Path) -> Optional[PdfReader]:
+    """
+    Open a PDF once so the parsed document can be shared between steps.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        
+    Returns:
+        PdfReader, or None if the file is missing or cannot be parsed
+    """
+    try:
+        return PdfReader(str(pdf_path))
+    except Exception:
+        return None
+
+
+def extract_form_fields(
+    pdf_path: str | Path,
+    reader: Optional[PdfReader] = None
+) -> Dict[str, Any]:
     """
     Extract all form fields from a fillable PDF.
     
     Args:
         pdf_path: Path to the PDF file
+        reader: Already-opened PdfReader for pdf_path (opened if omitted)
         
     Returns:
         Dictionary with extraction results:
@@ -43,7 +63,8 @@ def extract_form_fields(pdf_path: str | Path) -> Dict[str, Any]:
         }
     
     try:
-        reader = PdfReader(str(pdf_path))
+        if reader is None:
+            reader = PdfReader(str(pdf_path))
         all_fields = reader.get_fields()
         
         if all_fields is None or len(all_fields) == 0:
@@ -155,7 +176,10 @@ def get_all_field_names(pdf_path: str | Path) -> list:
     return []
 
 
-def extract_form_fields_for_structuring(pdf_path: str | Path) -> Dict[str, Any]:
+def extract_form_fields_for_structuring(
+    pdf_path: str | Path,
+    reader: Optional[PdfReader] = None
+) -> Dict[str, Any]:
     """
     Extract form fields in a format ready for downstream structuring.
     
@@ -164,11 +188,12 @@ def extract_form_fields_for_structuring(pdf_path: str | Path) -> Dict[str, Any]:
     
     Args:
         pdf_path: Path to PDF file
+        reader: Already-opened PdfReader for pdf_path (opened if omitted)
         
     Returns:
         Dictionary ready to send to downstream organization services
     """
-    result = extract_form_fields(pdf_path)
+    result = extract_form_fields(pdf_path, reader=reader)
     
     if not result["success"]:
         return {
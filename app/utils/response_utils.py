@@ -5,9 +5,18 @@ This module provides standardized response functions to ensure
 consistent API responses across all endpoints.
 """
 from typing import Any, Dict, Optional
-from fastapi.responses import JSONResponse
 from datetime import datetime
 
+import orjson
+from starlette.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (fastapi's own class is deprecated)"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 
 class APIResponse:
     """Standardized API response builder"""
@@ -17,7 +26,7 @@ class APIResponse:
         data: Dict[str, Any] = None,
         message: str = "Operation completed successfully",
         metadata: Dict[str, Any] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create standardized success response.
         
@@ -27,7 +36,7 @@ class APIResponse:
             metadata: Additional metadata (file_info, tokens_used, etc.)
             
         Returns:
-            JSONResponse with standardized format
+            ORJSONResponse with standardized format
         """
         response_data = {
             "success": True,
@@ -40,7 +49,7 @@ class APIResponse:
         if metadata:
             response_data["metadata"] = metadata
             
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=200,
             content=response_data
         )
@@ -51,7 +60,7 @@ class APIResponse:
         status_code: int = 400,
         error_code: str = None,
         details: Dict[str, Any] = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create standardized error response.
         
@@ -62,7 +71,7 @@ class APIResponse:
             details: Additional error details
             
         Returns:
-            JSONResponse with standardized format
+            ORJSONResponse with standardized format
         """
         response_data = {
             "success": False,
@@ -76,7 +85,7 @@ class APIResponse:
             }
         }
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
             content=response_data
         )
@@ -90,7 +99,7 @@ class APIResponse:
         tokens_used: Dict[str, Any] = None,
         model: str = None,
         json_file: str = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create standardized extraction success response.
         
@@ -104,7 +113,7 @@ class APIResponse:
             json_file: Generated JSON file name (optional)
             
         Returns:
-            JSONResponse with extraction-specific format
+            ORJSONResponse with extraction-specific format
         """
         data = {
             "formatted_data": formatted_data,
@@ -138,7 +147,7 @@ class APIResponse:
         confidence: float,
         filename: str,
         form_type: str = None
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """
         Create standardized detection success response.
         
@@ -150,7 +159,7 @@ class APIResponse:
             form_type: Detected form type (optional)
             
         Returns:
-            JSONResponse with detection-specific format
+            ORJSONResponse with detection-specific format
         """
         data = {
             "is_acord": is_acord,
@@ -194,4 +203,13 @@ def server_error(message="Internal server error occurred"):
         message=message,
         status_code=500,
         error_code="SERVER_ERROR"
-    )
\ No newline at end of file
+    )
+
+
+def server_busy_error(message="Server busy. Please retry shortly."):
+    """Shorthand for server busy (back-pressure) response"""
+    return APIResponse.error(
+        message=message,
+        status_code=503,
+        error_code="SERVER_BUSY"
+    )
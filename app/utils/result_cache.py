@@ -0,0 +1,188 @@
+"""
+Content-addressed cache for extraction results
+
+Re-uploads of the same PDF (retries, resubmits) are served from here
+instead of re-running detection and the AI/OCR pipelines.
+"""
+import os
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from app.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Disk entries are pruned every this many writes
+_PRUNE_INTERVAL = 32
+
+
+class ExtractionResultCache:
+    """
+    Two-level cache of extraction payloads keyed by file content hash.
+
+    - In-memory LRU for hot re-uploads (no disk read)
+    - JSON files in the cache folder, shared across workers and restarts
+
+    Entries older than max_age are treated as misses, and the cache folder
+    is pruned to max_disk_entries (oldest first).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int = 128,
+        max_disk_entries: int = 1000,
+        max_age: float = 7 * 24 * 3600
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Folder for the on-disk JSON entries
+            max_entries: Size of the in-memory LRU
+            max_disk_entries: Maximum number of JSON entries kept on disk
+            max_age: Seconds after which an entry is no longer served
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_age = max_age
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.max_age
+
+    def _remember(self, key: str, payload: Dict[str, Any], stored_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (stored_at, payload)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached payload.
+
+        Args:
+            key: Cache key (content hash)
+
+        Returns:
+            Cached payload, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if not self._is_expired(stored_at):
+                    self._memory.move_to_end(key)
+                    return payload
+                del self._memory[key]
+
+        path = self._entry_path(key)
+        try:
+            stored_at = path.stat().st_mtime
+            if self._is_expired(stored_at):
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self._remember(key, payload, stored_at)
+        return payload
+
+    def set(self, key: str, payload: Dict[str, Any]) -> bool:
+        """
+        Store a payload in memory and on disk.
+
+        The disk write goes to a temp file first and is moved into place
+        with os.replace, so readers never see a partial entry.
+
+        Args:
+            key: Cache key (content hash)
+            payload: JSON-serializable extraction payload
+
+        Returns:
+            True if the disk entry was written
+        """
+        self._remember(key, payload, time.time())
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            final_path = self._entry_path(key)
+            tmp_path = final_path.with_name(f"{final_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, final_path)
+        except Exception as e:
+            logger.warning(f"Result cache write failed for {key}: {e}")
+            return False
+
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % _PRUNE_INTERVAL == 1
+        if should_prune:
+            self.prune()
+        return True
+
+    def prune(self) -> int:
+        """
+        Remove expired disk entries, then the oldest ones beyond max_disk_entries.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith('.json'):
+                        continue
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            return 0
+
+        cutoff = time.time() - self.max_age
+        entries.sort()
+        excess = max(0, len(entries) - self.max_disk_entries)
+
+        removed = 0
+        for index, (mtime, path) in enumerate(entries):
+            if index >= excess and mtime >= cutoff:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+# Singleton instance
+_result_cache = None
+
+
+def get_result_cache() -> ExtractionResultCache:
+    """Get or create result cache singleton"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ExtractionResultCache(
+            Config.CACHE_FOLDER,
+            max_entries=Config.RESULT_CACHE_SIZE,
+            max_disk_entries=Config.RESULT_CACHE_DISK_ENTRIES,
+            max_age=Config.RESULT_CACHE_MAX_AGE
+        )
+    return _result_cache
@@ -2,14 +2,86 @@
 Utility functions for file handling and operations
 """
 import os
+import mmap
+import queue
 import shutil
-import json
+import hashlib
+import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, BinaryIO
+from anyio import to_thread
+import orjson
 from starlette.datastructures import UploadFile
 from app.config.config import Config
 
+# Read size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class BufferPool:
+    """
+    Fixed set of reusable bytearrays for streaming copies.
+    
+    Buffers are handed out instead of allocating a fresh bytes object per
+    chunk. If the pool is empty a temporary buffer is allocated, so callers
+    never block waiting for one.
+    """
+    
+    def __init__(self, count: int, size: int):
+        self.count = count
+        self.size = size
+        self._buffers = queue.SimpleQueue()
+        for _ in range(count):
+            self._buffers.put(bytearray(size))
+    
+    def acquire(self) -> bytearray:
+        try:
+            return self._buffers.get_nowait()
+        except queue.Empty:
+            return bytearray(self.size)
+    
+    def release(self, buf: bytearray) -> None:
+        # Temporary buffers are dropped once the pool is full again
+        if self._buffers.qsize() < self.count:
+            self._buffers.put(buf)
+
+
+_upload_buffers = BufferPool(Config.UPLOAD_BUFFER_COUNT, UPLOAD_CHUNK_SIZE)
+
+
+def _copy_upload(src: BinaryIO, file_path: Path) -> int:
+    """
+    Copy an upload's spooled file to disk through a pooled buffer.
+    
+    Stops once the size limit is exceeded.
+    
+    Args:
+        src: Underlying file object of the upload
+        file_path: Destination path
+    
+    Returns:
+        Number of bytes read from the upload
+    """
+    buf = _upload_buffers.acquire()
+    view = memoryview(buf)
+    total_size = 0
+    try:
+        with open(file_path, 'wb') as dst:
+            while n := src.readinto(buf):
+                total_size += n
+                
+                # Check file size
+                if total_size > Config.MAX_CONTENT_LENGTH:
+                    break
+                
+                dst.write(view[:n])
+    finally:
+        view.release()
+        _upload_buffers.release(buf)
+    
+    return total_size
+
 
 async def save_upload_file(file: UploadFile) -> Tuple[bool, str]:
     """
@@ -31,26 +103,26 @@ async def save_upload_file(file: UploadFile) -> Tuple[bool, str]:
         if file_ext != '.pdf':
             return False, f"Invalid file type. Only PDF files are allowed. Got: {file_ext}"
         
-        # Create unique filename to avoid collisions
+        # Create unique filename to avoid collisions (the random suffix keeps
+        # same-named files uploaded in the same second apart)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{file.filename}"
+        unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{file.filename}"
         
         # Ensure upload folder exists
         Config.UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
         
         file_path = Config.UPLOAD_FOLDER / unique_filename
         
-        # Save file
-        contents = await file.read()
+        # Stream file to disk in chunks instead of buffering it in memory
+        # (the whole copy runs in one worker thread, reusing pooled buffers)
+        await file.seek(0)
+        total_size = await to_thread.run_sync(_copy_upload, file.file, file_path)
         
-        # Check file size
-        if len(contents) > Config.MAX_CONTENT_LENGTH:
+        if total_size > Config.MAX_CONTENT_LENGTH:
+            os.remove(file_path)
             max_size_mb = Config.MAX_CONTENT_LENGTH / (1024 * 1024)
             return False, f"File too large. Maximum size is {max_size_mb:.1f}MB"
         
-        with open(file_path, 'wb') as f:
-            f.write(contents)
-        
         return True, str(file_path)
         
     except Exception as e:
@@ -77,6 +149,17 @@ def cleanup_file(file_path: str) -> bool:
         return False
 
 
+def generate_output_filename() -> str:
+    """
+    Generate a timestamped filename for a JSON extraction output
+    
+    Returns:
+        Filename (without folder)
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S%f")[:-3]
+    return f"extraction_{timestamp}.json"
+
+
 def save_json_output(
     extraction_result: Dict[str, Any],
     filename: str = None
@@ -97,14 +180,16 @@ def save_json_output(
         
         # Generate filename if not provided
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S%f")[:-3]
-            filename = f"extraction_{timestamp}.json"
+            filename = generate_output_filename()
         
         file_path = Config.OUTPUT_FOLDER / filename
         
-        # Save JSON
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(extraction_result, f, indent=2, ensure_ascii=False)
+        # Save JSON (orjson writes UTF-8 bytes directly, like ensure_ascii=False)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(
+                extraction_result,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
         
         return True, str(file_path)
         
@@ -112,6 +197,28 @@ def save_json_output(
         return False, f"JSON save failed: {str(e)}"
 
 
+def compute_file_hash(file_path: str) -> str:
+    """
+    Compute the SHA-256 of a file's contents
+    
+    The file is memory-mapped so hashlib reads it without copying it
+    into Python memory first.
+    
+    Args:
+        file_path: Path to file
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    with open(file_path, 'rb') as f:
+        # mmap refuses zero-length files
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.sha256(b'').hexdigest()
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.sha256(mm).hexdigest()
+
+
 def get_file_info(file_path: str) -> Dict[str, Any]:
     """
     Get information about a file
@@ -124,7 +231,8 @@ def get_file_info(file_path: str) -> Dict[str, Any]:
     """
     try:
         path = Path(file_path)
-        file_size = path.stat().st_size
+        stat = path.stat()
+        file_size = stat.st_size
         
         return {
             "filename": path.name,
@@ -133,7 +241,7 @@ def get_file_info(file_path: str) -> Dict[str, Any]:
             "file_size_kb": round(file_size / 1024, 2),
             "file_size_mb": round(file_size / (1024 * 1024), 2),
             "modified_time": datetime.fromtimestamp(
-                path.stat().st_mtime
+                stat.st_mtime
             ).isoformat()
         }
     except Exception as e:
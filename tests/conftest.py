@@ -0,0 +1,10 @@
+"""Shared pytest setup."""
+import os
+import sys
+from pathlib import Path
+
+# Make the app package importable when running pytest from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Services refuse to construct without a key; tests never call the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
@@ -0,0 +1,213 @@
+"""Tests for the ACORD tab formatter."""
+import json
+import random
+import re
+from pathlib import Path
+
+from app.services.acord.acord_formatter import format_checkbox, format_for_tabs, format_limit
+
+
+def _legacy_checkbox(value):
+    if value is None:
+        return "No"
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, str):
+        if value.lower().strip() in ['yes', 'y', 'true', '1', '/1', '/yes', 'x', 'checked']:
+            return "Yes"
+    return "No"
+
+
+def _legacy_limit(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        if value.lower().strip() in ['yes', 'no', 'true', 'false', 'y', 'n']:
+            return ""
+    return str(value)
+
+
+def _legacy_format_for_tabs(organized_data):
+    """The original hand-written format_for_tabs, kept as the reference."""
+    cb, lim = _legacy_checkbox, _legacy_limit
+    gl = organized_data.get("general_liability", {}) or {}
+    auto = organized_data.get("auto_liability", {}) or {}
+    umbrella = organized_data.get("umbrella", {}) or {}
+    wc = organized_data.get("workers_comp", {}) or {}
+    other = organized_data.get("other", {}) or {}
+    unformatted = organized_data.get("unformatted_data", {}) or {}
+
+    return {
+        "information": {
+            "certificate_date": organized_data.get("issue_date"),
+            "certificate_number": organized_data.get("certificate_number"),
+            "description_of_operations": organized_data.get("remarks"),
+            "certificate_holder": organized_data.get("certificate_holder"),
+            "authorized_representative": organized_data.get("authorized_representative")
+        },
+        "general_liability": {
+            "policy_information": {
+                "insurer_letter": gl.get("insurer_letter"),
+                "policy_number": gl.get("policy_number"),
+                "effective_date": gl.get("effective_date"),
+                "expiration_date": gl.get("expiration_date"),
+                "additional_insured": cb(gl.get("additional_insured")),
+                "subrogation_waived": cb(gl.get("subrogation_waived"))
+            },
+            "policy_options": {
+                "general_liability_coverage_indicator": cb(gl.get("general_liability_coverage_indicator")),
+                "claims_made": cb(gl.get("claims_made")),
+                "occurrence": cb(gl.get("occurrence")),
+                "custom_option_1": cb(gl.get("custom_option_1")),
+                "custom_option_1_value": gl.get("custom_option_1_value"),
+                "custom_option_2": cb(gl.get("custom_option_2")),
+                "custom_option_2_value": gl.get("custom_option_2_value"),
+                "aggregate_applies_policy": cb(gl.get("general_aggregate_limit_applies_per_policy")),
+                "aggregate_applies_project": cb(gl.get("general_aggregate_limit_applies_per_project")),
+                "aggregate_applies_location": cb(gl.get("general_aggregate_limit_applies_per_location")),
+                "aggregate_applies_other": cb(gl.get("general_aggregate_limit_applies_per_other")),
+                "aggregate_applies_other_value": gl.get("general_aggregate_limit_applies_per_other_value")
+            },
+            "policy_limits": {
+                "each_occurrence": lim(gl.get("each_occurrence")),
+                "damage_to_rented_premises": lim(gl.get("damage_to_rented_premises")),
+                "med_exp": lim(gl.get("medical_expense")),
+                "personal_adv_injury": lim(gl.get("personal_adv_injury")),
+                "general_aggregate": lim(gl.get("general_aggregate")),
+                "products_comp_op_agg": lim(gl.get("products_comp_op_agg"))
+            }
+        },
+        "automobile_liability": {
+            "policy_information": {
+                "insurer_letter": auto.get("insurer_letter"),
+                "policy_number": auto.get("policy_number"),
+                "effective_date": auto.get("effective_date"),
+                "expiration_date": auto.get("expiration_date"),
+                "additional_insured": cb(auto.get("additional_insured")),
+                "subrogation_waived": cb(auto.get("subrogation_waived"))
+            },
+            "policy_options": {
+                "any_auto": cb(auto.get("any_auto")),
+                "owned_autos_only": cb(auto.get("owned_autos_only")),
+                "hired_autos_only": cb(auto.get("hired_autos_only")),
+                "scheduled_autos_only": cb(auto.get("scheduled_autos_only")),
+                "non_owned_autos_only": cb(auto.get("non_owned_autos_only")),
+                "custom_option_1": cb(auto.get("custom_option_1")),
+                "custom_option_1_value": auto.get("custom_option_1_value"),
+                "custom_option_2": cb(auto.get("custom_option_2")),
+                "custom_option_2_value": auto.get("custom_option_2_value")
+            },
+            "policy_limits": {
+                "combined_single_limit": lim(auto.get("combined_single_limit")),
+                "bodily_injury_person": lim(auto.get("bodily_injury_per_person")),
+                "bodily_injury_accident": lim(auto.get("bodily_injury_per_accident")),
+                "property_damage": lim(auto.get("property_damage"))
+            }
+        },
+        "umbrella_liability": {
+            "policy_information": {
+                "insurer_letter": umbrella.get("insurer_letter"),
+                "policy_number": umbrella.get("policy_number"),
+                "effective_date": umbrella.get("effective_date"),
+                "expiration_date": umbrella.get("expiration_date"),
+                "additional_insured": cb(umbrella.get("additional_insured")),
+                "subrogation_waived": cb(umbrella.get("subrogation_waived"))
+            },
+            "policy_options": {
+                "umbrella_liability": cb(umbrella.get("umbrella_liab")),
+                "excess_liability": cb(umbrella.get("excess_liab")),
+                "occurrence": cb(umbrella.get("occurrence")),
+                "claims_made": cb(umbrella.get("claims_made")),
+                "deductible": cb(umbrella.get("deductible")),
+                "retention_checkbox": cb(umbrella.get("retention")),
+                "retention": lim(umbrella.get("retention_amount"))
+            },
+            "policy_limits": {
+                "each_occurrence": lim(umbrella.get("each_occurrence")),
+                "aggregate": lim(umbrella.get("aggregate"))
+            }
+        },
+        "workers_comp": {
+            "policy_information": {
+                "insurer_letter": wc.get("insurer_letter"),
+                "policy_number": wc.get("policy_number"),
+                "effective_date": wc.get("effective_date"),
+                "expiration_date": wc.get("expiration_date"),
+                "any_officers_excluded": cb(wc.get("any_excluded")),
+                "additional_insured": cb(wc.get("additional_insured")),
+                "subrogation_waived": cb(wc.get("subrogation_waived"))
+            },
+            "policy_options": {
+                "per_statute": cb(wc.get("per_statute")),
+                "other": cb(wc.get("other"))
+            },
+            "policy_limits": {
+                "per_statute_other_limit": lim(wc.get("per_statute_other_limit")),
+                "each_accident": lim(wc.get("each_accident")),
+                "each_employee": lim(wc.get("disease_each_employee")),
+                "disease_policy_limit": lim(wc.get("disease_policy_limit"))
+            }
+        },
+        "other_coverage": {
+            "policy_information": {
+                "insurer_letter": other.get("insurer_letter"),
+                "type_of_insurance": other.get("type_of_insurance") if other.get("type_of_insurance") else "Other",
+                "policy_number": other.get("policy_number"),
+                "effective_date": other.get("effective_date"),
+                "expiration_date": other.get("expiration_date"),
+                "additional_insured": cb(other.get("addl")),
+                "subrogation_waived": cb(other.get("subr"))
+            },
+            "policy_limits": [
+                {"policy_option": other.get("first_policy_option"), "policy_limit": lim(other.get("first_policy_limit"))},
+                {"policy_option": other.get("second_policy_option"), "policy_limit": lim(other.get("second_policy_limit"))},
+                {"policy_option": other.get("third_policy_option"), "policy_limit": lim(other.get("third_policy_limit"))}
+            ]
+        },
+        "unformatted_data": unformatted
+    }
+
+
+_SOURCE_KEYS = sorted(set(re.findall(
+    r'\.get\("([a-z0-9_]+)"\)',
+    Path(__file__).read_text(encoding="utf-8").split("def _legacy_format_for_tabs", 1)[1].split("_SOURCE_KEYS", 1)[0]
+)))
+_SECTIONS = ("general_liability", "auto_liability", "umbrella", "workers_comp", "other", "unformatted_data")
+_TOP_LEVEL = ("issue_date", "certificate_number", "remarks", "certificate_holder", "authorized_representative")
+_VALUES = (None, True, False, "yes", "No", "X", "1", "/1", " true ", "$1,000,000", 0, 5, "", "other")
+
+
+def _random_organized_data(rng):
+    data = {}
+    for section in _SECTIONS:
+        roll = rng.random()
+        if roll < 0.1:
+            continue
+        if roll < 0.2:
+            data[section] = None
+            continue
+        data[section] = {key: rng.choice(_VALUES) for key in _SOURCE_KEYS if rng.random() < 0.6}
+    for key in _TOP_LEVEL:
+        if rng.random() < 0.5:
+            data[key] = rng.choice(_VALUES)
+    return data
+
+
+def test_format_for_tabs_matches_legacy_output_including_key_order():
+    rng = random.Random(4321)
+    for _ in range(5000):
+        data = _random_organized_data(rng)
+        assert json.dumps(format_for_tabs(data)) == json.dumps(_legacy_format_for_tabs(data))
+
+
+def test_empty_sections_are_independent_copies():
+    first = format_for_tabs({})
+    first["general_liability"]["policy_information"]["policy_number"] = "mutated"
+
+    assert format_for_tabs({})["general_liability"]["policy_information"]["policy_number"] is None
+
+
+def test_checkbox_and_limit_match_legacy():
+    for value in _VALUES + ("Checked", "N", "FALSE", " Y "):
+        assert format_checkbox(value) == _legacy_checkbox(value)
+        assert format_limit(value) == _legacy_limit(value)
@@ -0,0 +1,71 @@
+"""Tests for AcordOrganizer batch organizing."""
+import asyncio
+import json
+import threading
+import time
+
+from app.config.config import Config
+from app.services.acord.acord_organizer import AcordOrganizer
+
+
+class FakeOpenAIService:
+    """Echoes the form's marker field back and records peak concurrency."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def chat_completion(self, messages, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            prompt = messages[-1]["content"]
+            raw = json.loads(prompt.split("INPUT: ", 1)[1].split("\n", 1)[0])
+            # Later forms finish first, so ordering can't come from completion order
+            time.sleep(self.delay / (1 + int(raw["Marker"])))
+            return {"success": True, "content": json.dumps({"marker": raw["Marker"]})}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _organizer(fake: FakeOpenAIService) -> AcordOrganizer:
+    organizer = AcordOrganizer.__new__(AcordOrganizer)
+    organizer.openai_service = fake
+    return organizer
+
+
+def _forms(count: int):
+    return [{"Marker": str(index)} for index in range(count)]
+
+
+def _markers(results):
+    return [result["unformatted_data"]["marker"] for result in results]
+
+
+def test_organize_many_async_preserves_order_and_caps_concurrency(monkeypatch):
+    monkeypatch.setattr(Config, "ORGANIZE_CONCURRENCY", 3)
+    fake = FakeOpenAIService()
+
+    results = asyncio.run(_organizer(fake).organize_many_async(_forms(10)))
+
+    assert _markers(results) == [str(index) for index in range(10)]
+    assert 1 < fake.peak <= 3
+
+
+def test_organize_many_sync_preserves_order_and_caps_concurrency(monkeypatch):
+    monkeypatch.setattr(Config, "ORGANIZE_CONCURRENCY", 2)
+    fake = FakeOpenAIService()
+
+    results = _organizer(fake).organize_many(_forms(6))
+
+    assert _markers(results) == [str(index) for index in range(6)]
+    assert 1 < fake.peak <= 2
+
+
+def test_organize_many_empty():
+    assert _organizer(FakeOpenAIService()).organize_many([]) == []
+    assert asyncio.run(_organizer(FakeOpenAIService()).organize_many_async([])) == []
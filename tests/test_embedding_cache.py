@@ -0,0 +1,79 @@
+"""Tests for the SQLite embedding cache."""
+import sqlite3
+
+import pytest
+
+from app.services.ai.embedding_cache import EmbeddingCache
+
+
+def _compute(calls):
+    def compute(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+    return compute
+
+
+def test_get_or_compute_many_caches_in_input_order(tmp_path):
+    cache = EmbeddingCache(tmp_path / "e.sqlite3")
+    calls = []
+
+    first = cache.get_or_compute_many(["a", "bb", "a"], "m", 2, _compute(calls))
+    second = cache.get_or_compute_many(["bb", "a"], "m", 2, _compute(calls))
+
+    assert first == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+    assert second == [[2.0, 0.5], [1.0, 0.5]]
+    assert calls == [["a", "bb", "a"]]
+
+
+def test_get_or_compute_many_rejects_wrong_vector_count(tmp_path):
+    cache = EmbeddingCache(tmp_path / "e.sqlite3")
+
+    with pytest.raises(ValueError, match="1 vectors for 2 texts"):
+        cache.get_or_compute_many(["x", "y"], "m", 2, lambda texts: [[1.0, 1.0]])
+
+
+def test_disabled_cache_never_opens_database(tmp_path):
+    db_path = tmp_path / "sub" / "e.sqlite3"
+    cache = EmbeddingCache(db_path, enabled=False)
+    calls = []
+
+    cache.get_or_compute_many(["a"], "m", 2, _compute(calls))
+    cache.get_or_compute_many(["a"], "m", 2, _compute(calls))
+
+    assert len(calls) == 2
+    assert not db_path.exists()
+
+
+def test_expired_rows_are_recomputed_and_pruned(tmp_path):
+    cache = EmbeddingCache(tmp_path / "e.sqlite3", max_age=3600)
+    calls = []
+    cache.get_or_compute_many(["a", "b"], "m", 2, _compute(calls))
+
+    cache._connect().execute("UPDATE embeddings SET created_at = 0")
+
+    cache.get_or_compute_many(["a"], "m", 2, _compute(calls))
+    assert calls[-1] == ["a"]
+    # "b" is still expired; "a" was refreshed
+    assert cache.prune() == 1
+
+
+def test_prune_keeps_newest_max_rows(tmp_path):
+    cache = EmbeddingCache(tmp_path / "e.sqlite3", max_rows=3)
+    for index in range(6):
+        cache.get_or_compute_many([f"t{index}"], "m", 2, _compute([]))
+
+    cache.prune()
+
+    (count,) = cache._connect().execute("SELECT COUNT(*) FROM embeddings").fetchone()
+    assert count == 3
+
+
+def test_legacy_database_gains_created_at(tmp_path):
+    db_path = tmp_path / "e.sqlite3"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    cache = EmbeddingCache(db_path)
+    assert cache.get_or_compute_many(["a"], "m", 2, _compute([])) == [[1.0, 0.5]]
@@ -0,0 +1,63 @@
+"""Tests for the extraction result cache."""
+import os
+import time
+
+from app.utils.result_cache import ExtractionResultCache
+
+
+def _age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_get_returns_stored_payload_from_memory_and_disk(tmp_path):
+    cache = ExtractionResultCache(tmp_path, max_entries=2)
+    assert cache.set("k", {"formatted_data": {"a": 1}})
+
+    assert cache.get("k") == {"formatted_data": {"a": 1}}
+
+    # A fresh instance (another worker, or after a restart) reads the disk entry
+    assert ExtractionResultCache(tmp_path).get("k") == {"formatted_data": {"a": 1}}
+    assert cache.get("missing") is None
+
+
+def test_expired_disk_entry_is_a_miss_and_removed(tmp_path):
+    cache = ExtractionResultCache(tmp_path, max_age=60)
+    cache.set("k", {"v": 1})
+    _age(tmp_path / "k.json", 120)
+
+    fresh = ExtractionResultCache(tmp_path, max_age=60)
+    assert fresh.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_expired_memory_entry_is_a_miss(tmp_path, monkeypatch):
+    cache = ExtractionResultCache(tmp_path, max_age=60)
+    cache.set("k", {"v": 1})
+    _age(tmp_path / "k.json", 120)
+
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert cache.get("k") is None
+
+
+def test_prune_removes_expired_then_oldest(tmp_path):
+    cache = ExtractionResultCache(tmp_path, max_disk_entries=3, max_age=3600)
+    for index in range(6):
+        cache.set(f"k{index}", {"v": index})
+        _age(tmp_path / f"k{index}.json", 600 - index * 10)
+    _age(tmp_path / "k5.json", 7200)
+
+    removed = cache.prune()
+
+    assert removed == 3
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["k2.json", "k3.json", "k4.json"]
+
+
+def test_set_prunes_periodically(tmp_path):
+    cache = ExtractionResultCache(tmp_path, max_disk_entries=5)
+    for index in range(40):
+        cache.set(f"k{index}", {"v": index})
+
+    # Pruned on the 33rd write; at most 7 entries written since
+    assert len(list(tmp_path.glob("*.json"))) <= 5 + 7
@@ -0,0 +1,128 @@
+"""Tests for VectorizeService text chunking and QueryBatcher."""
+import asyncio
+import random
+from typing import List
+
+import pytest
+
+from app.modules.vectorize.vectorize_service import QueryBatcher, VectorizeService
+
+
+def _legacy_chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """The original while-loop implementation, kept as the reference."""
+    normalized = (text or "").strip()
+    if not normalized:
+        return []
+
+    if overlap >= chunk_size:
+        raise ValueError("chunk overlap must be smaller than chunk size")
+
+    chunks: List[str] = []
+    stride = chunk_size - overlap
+    start = 0
+    text_len = len(normalized)
+
+    while start < text_len:
+        end = min(start + chunk_size, text_len)
+        chunk = normalized[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= text_len:
+            break
+        start += stride
+
+    return chunks
+
+
+def test_chunk_text_matches_legacy_implementation():
+    rng = random.Random(1234)
+    for _ in range(20000):
+        text = "".join(rng.choice("ab \n") for _ in range(rng.randint(0, 60)))
+        chunk_size = rng.randint(2, 20)
+        overlap = rng.randint(0, chunk_size - 1)
+        assert VectorizeService._chunk_text(text, chunk_size, overlap) == \
+            _legacy_chunk_text(text, chunk_size, overlap)
+
+
+def test_chunk_text_default_sizes():
+    text = "word " * 1000
+    assert VectorizeService._chunk_text(
+        text, VectorizeService.CHUNK_SIZE, VectorizeService.CHUNK_OVERLAP
+    ) == _legacy_chunk_text(text, VectorizeService.CHUNK_SIZE, VectorizeService.CHUNK_OVERLAP)
+
+
+def test_chunk_text_rejects_overlap_not_smaller_than_size():
+    with pytest.raises(ValueError):
+        VectorizeService._chunk_text("short", 10, 10)
+
+
+
+def _submit_all(batcher: QueryBatcher, count: int):
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(batcher.submit("q" * (index + 1)) for index in range(count)),
+                return_exceptions=True
+            ),
+            timeout=5
+        )
+    return run
+
+
+def test_query_batcher_coalesces_and_preserves_order():
+    calls = []
+
+    def embed(texts):
+        calls.append(len(texts))
+        return [[float(len(text))] for text in texts]
+
+    async def run():
+        batcher = QueryBatcher(embed, max_batch=8, max_wait_ms=20)
+        return await _submit_all(batcher, 20)()
+
+    results = asyncio.run(run())
+
+    assert results == [[float(index + 1)] for index in range(20)]
+    assert calls == [8, 8, 4]
+
+
+def test_query_batcher_fails_every_caller_on_short_result_and_keeps_running():
+    mode = {"short": True}
+
+    def embed(texts):
+        if mode["short"]:
+            return [[1.0]] * (len(texts) - 1)
+        return [[2.0] for _ in texts]
+
+    async def run():
+        batcher = QueryBatcher(embed, max_batch=32, max_wait_ms=10)
+        first = await _submit_all(batcher, 5)()
+        mode["short"] = False
+        second = await _submit_all(batcher, 3)()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in first)
+    assert second == [[2.0]] * 3
+
+
+def test_query_batcher_fans_out_embedder_errors_and_keeps_running():
+    mode = {"fail": True}
+
+    def embed(texts):
+        if mode["fail"]:
+            raise ValueError("boom")
+        return [[3.0] for _ in texts]
+
+    async def run():
+        batcher = QueryBatcher(embed, max_batch=32, max_wait_ms=10)
+        first = await _submit_all(batcher, 4)()
+        mode["fail"] = False
+        second = await _submit_all(batcher, 2)()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in first)
+    assert second == [[3.0]] * 2